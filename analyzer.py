@@ -3,86 +3,145 @@ Analyzer Module - Simplified Bollinger Band Analysis
 Calculates direction and Bollinger Bands for simple messaging
 """
 
-import pandas as pd
+import asyncio
+import math
+from dataclasses import dataclass
+
+import numpy as np
 import ccxt.async_support as ccxt
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _bb_last(a, period, k):
+        """
+        Son `period` mum için tek geçişte Bollinger Bantları.
+        Pandas rolling().std() ile aynı sonuç için örneklem std (ddof=1) kullanır.
+        """
+        s = 0.0
+        s2 = 0.0
+        n = a.shape[0]
+        for i in range(n - period, n):
+            x = a[i]
+            s += x
+            s2 += x * x
+        m = s / period
+        var = (s2 - s * m) / (period - 1)
+        sd = math.sqrt(max(var, 0.0))
+        return m + k * sd, m, m - k * sd
+else:
+    def _bb_last(a, period, k):
+        """Numba yoksa: son pencere üzerinde tek NumPy indirgemesi."""
+        window = a[-period:]
+        m = window.mean()
+        sd = window.std(ddof=1)
+        return m + k * sd, m, m - k * sd
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """Advanced analysis output for a single symbol."""
+    symbol: str
+    price: float
+    is_long: bool
+    bb_upper: float   # Üst bant
+    bb_middle: float  # Orta (SMA)
+    bb_lower: float   # Alt bant
+    change_5m: float  # 5 dakikalık yüzde
+
+    @property
+    def direction(self) -> str:
+        return "LONG" if self.is_long else "SHORT"
+
 
 def calculate_bollinger_bands(prices, period=20, std_dev=2):
     """
     Manuel Bollinger Band hesaplaması.
     
     Args:
-        prices: Pandas Series of closing prices
+        prices: Closing prices (NumPy array or sequence)
         period: MA period (default 20)
         std_dev: Standard deviation multiplier (default 2)
         
     Returns:
         Tuple of (upper_band, middle_band, lower_band)
     """
-    # Basit Hareketli Ortalama (SMA)
-    sma = prices.rolling(window=period, min_periods=period).mean()
-    
-    # Standart Sapma
-    std = prices.rolling(window=period, min_periods=period).std()
-    
-    # Bollinger Bantları
-    upper_band = sma + (std * std_dev)
-    lower_band = sma - (std * std_dev)
-    
-    return upper_band.iloc[-1], sma.iloc[-1], lower_band.iloc[-1]
+    closes = np.asarray(prices, dtype=np.float64)
+
+    # rolling(min_periods=period) davranışı: yeterli veri yoksa NaN
+    if closes.shape[0] < period:
+        return math.nan, math.nan, math.nan
+
+    return _bb_last(closes, period, float(std_dev))
 
 
 async def get_advanced_analysis(exchange, symbol: str):
     """
     Basitleştirilmiş analiz: Yön + Bollinger Band + 5dk değişim.
     
+    `exchange` uzun ömürlü olmalı: bir kez enableRateLimit=True ile oluşturulup
+    tüm çağrılarda tekrar kullanılır ve kapanışta `await exchange.close()`
+    çağrılır. ccxt her örnek için tek aiohttp oturumu tuttuğundan, çağrı başına
+    yeni exchange her seferinde yeni TCP+TLS el sıkışması demektir.
+    
     Args:
-        exchange: CCXT exchange instance
+        exchange: Shared ccxt.async_support exchange instance
         symbol: Trading pair symbol (e.g., 'BTC/USDT')
         
     Returns:
-        Dict with symbol, price, direction, BB levels, and 5m change
+        AnalysisResult with price, direction, BB levels, and 5m change
     """
     try:
         # 1. Ana Analiz Verisi (15 Dakikalık - Trend ve BB için)
-        ohlcv = await exchange.fetch_ohlcv(symbol, timeframe='15m', limit=50)
+        # 5 dakikalık veri de bağımsız, iki isteği aynı anda gönder
+        ohlcv, ohlcv_5m = await asyncio.gather(
+            exchange.fetch_ohlcv(symbol, timeframe='15m', limit=50),
+            exchange.fetch_ohlcv(symbol, timeframe='5m', limit=2),
+            return_exceptions=True
+        )
+        for result in (ohlcv, ohlcv_5m):
+            if isinstance(result, Exception):
+                raise result
         
         if not ohlcv or len(ohlcv) < 25:
             return None
             
-        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        current_price = df['close'].iloc[-1]
+        # Sadece kapanış sütunu gerekli, tam DataFrame kurmaya gerek yok
+        closes = np.fromiter((candle[4] for candle in ohlcv), dtype=np.float64, count=len(ohlcv))
+        current_price = closes[-1]
         
         # 2. Bollinger Bantlarını Hesapla (20 mumluk, 2 standart sapma)
-        bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(df['close'], period=20, std_dev=2)
+        bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(closes, period=20, std_dev=2)
 
         # 3. 5 Dakikalık Değişim Verisi
-        ohlcv_5m = await exchange.fetch_ohlcv(symbol, timeframe='5m', limit=2)
-        
         if not ohlcv_5m or len(ohlcv_5m) < 2:
             # 5dk verisi yoksa, mevcut mumdan tahmini yap
             change_5m_pct = 0.0
         else:
-            df_5m = pd.DataFrame(ohlcv_5m, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            
             # Son 5 dakikalık mumun değişimi: (Kapanış - Açılış) / Açılış
-            last_5m_open = df_5m['open'].iloc[-1]
-            last_5m_close = df_5m['close'].iloc[-1]
+            # OHLCV satırı: [timestamp, open, high, low, close, volume]
+            last_5m = ohlcv_5m[-1]
+            last_5m_open = last_5m[1]
+            last_5m_close = last_5m[4]
             change_5m_pct = ((last_5m_close - last_5m_open) / last_5m_open) * 100
 
         # 4. Yön Tayini (5 Dakikalık Değişime Göre)
         # Artık 5dk değişimi kullanıyoruz, böylece direction ile change_5m uyumlu olur
-        direction = "LONG" if change_5m_pct > 0 else "SHORT"
-
-        return {
-            "symbol": symbol,
-            "price": current_price,
-            "direction": direction,
-            "bb_upper": bb_upper,    # Üst bant
-            "bb_middle": bb_middle,  # Orta (SMA)
-            "bb_lower": bb_lower,    # Alt bant
-            "change_5m": change_5m_pct  # 5 dakikalık yüzde
-        }
+        return AnalysisResult(
+            symbol=symbol,
+            price=float(current_price),
+            is_long=change_5m_pct > 0,
+            bb_upper=float(bb_upper),
+            bb_middle=float(bb_middle),
+            bb_lower=float(bb_lower),
+            change_5m=float(change_5m_pct)
+        )
 
     except Exception as e:
         print(f"Analiz hatası {symbol}: {e}")
@@ -6,19 +6,114 @@ Sends rich-formatted alerts with inline buttons.
 import asyncio
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.constants import ParseMode
 from telegram.error import TelegramError
-from telegram.ext import Application, CallbackQueryHandler, ContextTypes
+from telegram.ext import AIORateLimiter, Application, CallbackQueryHandler, ContextTypes, ExtBot
+from telegram.request import HTTPXRequest
 
 from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
-from scanner import ScanResult
+from scanner import ScanResult, base_asset_from_symbol
 from inspector import OnChainSignal, SignalType
 
 logger = logging.getLogger(__name__)
 
+# Sabit kısım tek seferde formatlanır; opsiyonel satırlar sonradan eklenir
+_SIGNAL_TEMPLATE = (
+    "🚨 *SIGNAL DETECTED: #{base_asset}*\n"
+    "\n"
+    "📊 *Market Data:*\n"
+    "• Price: `${price:,.4f}` ({change:+.2f}% {price_emoji})\n"
+    "• Vol Spike: `{spike:.0f}x` average\n"
+    "• Trigger: {trigger}\n"
+    "\n"
+    "🔗 *On-Chain Intel:*\n"
+    "• Bias: {bias_emoji} *{bias_text}*\n"
+    "• Confidence: `{confidence}%`"
+)
+_SIGNAL_FOOTER = "\n\n⏰ _Analyzed {transfers} on-chain transfers_"
+
+# Markdown reddedilirse gönderilecek düz metin şablonları
+_SIGNAL_TEMPLATE_PLAIN = _SIGNAL_TEMPLATE.replace("*", "").replace("`", "")
+_SIGNAL_FOOTER_PLAIN = "\n\n⏰ Analyzed {transfers} on-chain transfers"
+
+# Markdown özel karakterlerini tek geçişte kaçır
+_MD_ESCAPE = str.maketrans({"_": "\\_", "*": "\\*", "`": "\\`", "[": "\\["})
+
+def _build_request() -> HTTPXRequest:
+    """
+    Keep-alive HTTPX pool for one Bot.
+    
+    Her TelegramReporter kendi havuzunu alır: paylaşılan havuzda bir botun
+    shutdown()'ı httpx istemcisini diğer tüm botlar için de kapatıyordu.
+    """
+    return HTTPXRequest(connection_pool_size=16, connect_timeout=5)
+
+
+def _build_rate_limiter() -> Optional[AIORateLimiter]:
+    """
+    Telegram'ın gerçek limitleri (30 msg/sn genel, 20 msg/dk grup) için sabit
+    sleep yerine PTB'nin AIORateLimiter'ı. `aiolimiter` kurulu değilse
+    (python-telegram-bot[rate-limiter]) RuntimeError verir; o zaman limitsiz.
+    """
+    try:
+        return AIORateLimiter(overall_max_rate=30, overall_time_period=1, group_max_rate=20)
+    except RuntimeError as e:
+        logger.warning(f"Telegram rate limiter unavailable: {e}")
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _keyboard_cached(
+    base_asset: str,
+    token_address: Optional[str],
+    chain: str
+) -> InlineKeyboardMarkup:
+    """
+    Build the Chart/Explorer keyboard for a coin.
+
+    Aynı coin için butonlar hep aynı; InlineKeyboardMarkup değiştirilemez
+    olduğundan tek nesne tüm mesajlarda tekrar kullanılabilir.
+    """
+    buttons = []
+
+    tradingview_url = f"https://www.tradingview.com/chart/?symbol=BINANCE:{base_asset}USDT.P"
+    buttons.append(
+        InlineKeyboardButton("📊 TradingView", url=tradingview_url)
+    )
+
+    binance_url = f"https://www.binance.com/en/futures/{base_asset}USDT"
+    buttons.append(
+        InlineKeyboardButton("💹 Binance", url=binance_url)
+    )
+
+    if token_address:
+        if chain == "bsc":
+            explorer_url = f"https://bscscan.com/token/{token_address}"
+            buttons.append(
+                InlineKeyboardButton("🔍 BSCScan", url=explorer_url)
+            )
+        else:
+            explorer_url = f"https://etherscan.io/token/{token_address}"
+            buttons.append(
+                InlineKeyboardButton("🔍 Etherscan", url=explorer_url)
+            )
+
+    keyboard = [buttons[:2]]
+    if len(buttons) > 2:
+        keyboard.append([buttons[2]])
+
+    return InlineKeyboardMarkup(keyboard)
+
+
+async def _button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle button clicks."""
+    query = update.callback_query
+    await query.answer("Button clicked!")
+
 
 @dataclass
 class AlertMessage:
@@ -33,6 +128,13 @@ class AlertMessage:
     chain: str = "ethereum"
 
 
+@dataclass
+class RenderedAlert:
+    """Alert text rendered once for both Markdown and plain-text delivery."""
+    markdown: str
+    plain: str
+
+
 class TelegramReporter:
     """
     Sends rich-formatted trading signals to Telegram.
@@ -57,55 +159,80 @@ class TelegramReporter:
     def bot(self) -> Bot:
         """Lazy initialization of Telegram bot."""
         if self._bot is None:
-            self._bot = Bot(token=self.bot_token)
+            rate_limiter = _build_rate_limiter()
+            if rate_limiter is not None:
+                self._bot = ExtBot(
+                    token=self.bot_token,
+                    request=_build_request(),
+                    rate_limiter=rate_limiter
+                )
+            else:
+                self._bot = Bot(token=self.bot_token, request=_build_request())
         return self._bot
 
+    @property
+    def is_rate_limited(self) -> bool:
+        """True if the bot paces its own sends (AIORateLimiter is active)."""
+        return getattr(self.bot, "rate_limiter", None) is not None
+
     def format_signal_message(
         self,
         scan_result: ScanResult,
         signal: OnChainSignal
-    ) -> str:
+    ) -> RenderedAlert:
         """
         Format a rich alert message.
         
         Returns:
-            Formatted markdown string
+            RenderedAlert with the Markdown message and its plain-text fallback
         """
         price_emoji = "📈" if scan_result.price_change_1h > 0 else "📉"
         
-        message_lines = [
-            f"🚨 *SIGNAL DETECTED: #{scan_result.base_asset}*",
-            "",
-            "📊 *Market Data:*",
-            f"• Price: `${scan_result.current_price:,.4f}` ({scan_result.price_change_1h:+.2f}% {price_emoji})",
-            f"• Vol Spike: `{scan_result.volume_spike_ratio:.0f}x` average",
-            f"• Trigger: {scan_result.trigger_reason}",
-            "",
-            "🔗 *On-Chain Intel:*",
-            f"• Bias: {signal.bias_emoji} *{signal.bias_text}*",
-            f"• Confidence: `{signal.confidence_score}%`",
-        ]
+        fields = dict(
+            base_asset=scan_result.base_asset,
+            price=scan_result.current_price,
+            change=scan_result.price_change_1h,
+            price_emoji=price_emoji,
+            spike=scan_result.volume_spike_ratio,
+            trigger=scan_result.trigger_reason,
+            bias_emoji=signal.bias_emoji,
+            bias_text=signal.bias_text,
+            confidence=signal.confidence_score
+        )
+        markdown = _SIGNAL_TEMPLATE.format_map(fields)
+        plain = _SIGNAL_TEMPLATE_PLAIN.format_map(fields)
+
+        # Opsiyonel satırlar (0-7 adet), her iki biçim için aynı döngüde
+        md_lines = []
+        plain_lines = []
 
         if signal.evidence:
-            message_lines.append("• Reason:")
+            md_lines.append("• Reason:")
+            plain_lines.append("• Reason:")
             for evidence in signal.evidence[:3]:
-                clean_evidence = evidence.replace("_", "\\_").replace("*", "\\*")
-                message_lines.append(f"  └ {clean_evidence}")
+                md_lines.append(f"  └ {evidence.translate(_MD_ESCAPE)}")
+                plain_lines.append(f"  └ {evidence}")
 
         if signal.whale_transfers > 0:
-            message_lines.append(f"• Whale Activity: {signal.whale_transfers} transfers")
+            line = f"• Whale Activity: {signal.whale_transfers} transfers"
+            md_lines.append(line)
+            plain_lines.append(line)
 
         if signal.exchange_deposits > 0:
-            message_lines.append(f"• Exchange Deposits: `${signal.exchange_deposits:,.0f}`")
+            md_lines.append(f"• Exchange Deposits: `${signal.exchange_deposits:,.0f}`")
+            plain_lines.append(f"• Exchange Deposits: ${signal.exchange_deposits:,.0f}")
         if signal.exchange_withdrawals > 0:
-            message_lines.append(f"• Exchange Withdrawals: `${signal.exchange_withdrawals:,.0f}`")
+            md_lines.append(f"• Exchange Withdrawals: `${signal.exchange_withdrawals:,.0f}`")
+            plain_lines.append(f"• Exchange Withdrawals: ${signal.exchange_withdrawals:,.0f}")
 
-        message_lines.extend([
-            "",
-            f"⏰ _Analyzed {signal.analyzed_transfers} on-chain transfers_"
-        ])
+        if md_lines:
+            markdown += "\n" + "\n".join(md_lines)
+            plain += "\n" + "\n".join(plain_lines)
 
-        return "\n".join(message_lines)
+        return RenderedAlert(
+            markdown=markdown + _SIGNAL_FOOTER.format(transfers=signal.analyzed_transfers),
+            plain=plain + _SIGNAL_FOOTER_PLAIN.format(transfers=signal.analyzed_transfers)
+        )
 
     def create_inline_keyboard(
         self,
@@ -119,37 +246,8 @@ class TelegramReporter:
         Returns:
             InlineKeyboardMarkup with action buttons
         """
-        base_asset = symbol.split('/')[0].replace(':USDT', '')
-        
-        buttons = []
-
-        tradingview_url = f"https://www.tradingview.com/chart/?symbol=BINANCE:{base_asset}USDT.P"
-        buttons.append(
-            InlineKeyboardButton("📊 TradingView", url=tradingview_url)
-        )
-
-        binance_url = f"https://www.binance.com/en/futures/{base_asset}USDT"
-        buttons.append(
-            InlineKeyboardButton("💹 Binance", url=binance_url)
-        )
-
-        if token_address:
-            if chain == "bsc":
-                explorer_url = f"https://bscscan.com/token/{token_address}"
-                buttons.append(
-                    InlineKeyboardButton("🔍 BSCScan", url=explorer_url)
-                )
-            else:
-                explorer_url = f"https://etherscan.io/token/{token_address}"
-                buttons.append(
-                    InlineKeyboardButton("🔍 Etherscan", url=explorer_url)
-                )
-
-        keyboard = [buttons[:2]]
-        if len(buttons) > 2:
-            keyboard.append([buttons[2]])
-
-        return InlineKeyboardMarkup(keyboard)
+        base_asset = base_asset_from_symbol(symbol)
+        return _keyboard_cached(base_asset, token_address, chain)
 
     async def send_alert(
         self,
@@ -174,7 +272,7 @@ class TelegramReporter:
             logger.warning("Telegram chat ID not configured")
             return False
 
-        message = self.format_signal_message(scan_result, signal)
+        rendered = self.format_signal_message(scan_result, signal)
         keyboard = self.create_inline_keyboard(
             scan_result.symbol,
             scan_result.token_address,
@@ -184,7 +282,7 @@ class TelegramReporter:
         try:
             await self.bot.send_message(
                 chat_id=target_chat,
-                text=message,
+                text=rendered.markdown,
                 parse_mode=ParseMode.MARKDOWN,
                 reply_markup=keyboard
             )
@@ -194,10 +292,9 @@ class TelegramReporter:
         except TelegramError as e:
             logger.error(f"Telegram error: {e}")
             try:
-                plain_message = message.replace("*", "").replace("`", "").replace("_", "")
                 await self.bot.send_message(
                     chat_id=target_chat,
-                    text=plain_message,
+                    text=rendered.plain,
                     reply_markup=keyboard
                 )
                 return True
@@ -252,12 +349,7 @@ class TelegramReporter:
             self._application = Application.builder().token(self.bot_token).build()
             
             # Add callback query handler (currently unused, ready for future features)
-            async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
-                """Handle button clicks."""
-                query = update.callback_query
-                await query.answer("Button clicked!")
-            
-            self._application.add_handler(CallbackQueryHandler(button_callback))
+            self._application.add_handler(CallbackQueryHandler(_button_callback))
             
             # Start the application
             await self._application.initialize()
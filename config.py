@@ -4,7 +4,8 @@ Optimized for high-quality signals and noise reduction.
 """
 
 import os
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping
 
 # =============================================================================
 # TELEGRAM CONFIGURATION
@@ -50,6 +51,9 @@ MIN_VOLUME_USD_5M: float = 100_000.0
 # Tarama sıklığı (Saniye). 30 saniye API limitleri için idealdir.
 SCAN_INTERVAL_SECONDS: int = 30       
 
+# USDT-M parite listesi önbelleği. Yeni vadeli listelemeler nadir olduğundan 12 saat.
+PAIRS_CACHE_TTL_SECONDS: int = 12 * 60 * 60
+
 # =============================================================================
 # ON-CHAIN INSPECTOR SETTINGS
 # =============================================================================
@@ -108,11 +112,23 @@ TOKEN_ADDRESSES: Dict[str, Dict[str, str]] = {
     }
 }
 
+# Çalışma anında değişmez: anahtarlar büyük harfe normalize edilip salt-okunur yapılır
+TOKEN_ADDRESSES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    symbol.upper(): MappingProxyType(dict(addresses))
+    for symbol, addresses in TOKEN_ADDRESSES.items()
+})
+
 # =============================================================================
 # KNOWN WALLETS FILE PATH
 # =============================================================================
 KNOWN_WALLETS_PATH: str = "data/known_wallets.json"
 
+# =============================================================================
+# TOKEN ADDRESS CACHE (DEX Screener çözümlemeleri, yeniden başlatmalar arası)
+# =============================================================================
+ADDRESS_CACHE_PATH: str = "data/address_cache.json"
+ADDRESS_CACHE_TTL_SECONDS: int = 24 * 60 * 60  # 24 saat
+
 # =============================================================================
 # WEB DASHBOARD SETTINGS
 # =============================================================================
@@ -3,16 +3,34 @@ Web Dashboard - Flask Application
 Provides REST API and WebSocket for real-time signal monitoring.
 """
 
+# eventlet diğer tüm importlardan önce yamalanmalı (socket, threading, time)
+import eventlet
+eventlet.monkey_patch()
+
 import logging
+import threading
+from pathlib import Path
+import orjson
 from flask import Flask, render_template, jsonify, send_from_directory, request
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
-from signal_manager import SignalManager
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables (config, signal_manager import edilirken okunur)
 load_dotenv()
 
+from signal_manager import SignalManager
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    # Yerel Observer (inotify) eventlet yamalı os.read içinde tüm süreci
+    # kilitliyor ve socketio.run'a hiç ulaşılmıyor; yoklama tabanlı
+    # gözlemci yalnızca os.stat kullanır, yeşil thread'lerle uyumludur.
+    from watchdog.observers.polling import PollingObserver
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -23,13 +41,47 @@ app = Flask(__name__,
 app.config['SECRET_KEY'] = 'scalp-trade-dashboard-secret'
 CORS(app)
 
+
+class _OrjsonSocketIOJson:
+    """json-module shim so Socket.IO packets are encoded with orjson."""
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        # python-socketio separators vb. geçirir; orjson zaten kompakt yazar
+        return orjson.dumps(obj).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+
+def ojsonify(obj):
+    """jsonify() equivalent backed by orjson (bytes straight into the response)."""
+    return app.response_class(orjson.dumps(obj), mimetype='application/json')
+
+
 # Initialize SocketIO
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet',
+                    json=_OrjsonSocketIOJson)
 
 # Initialize Signal Manager
 signal_manager = SignalManager()
 
 
+# Son yayınlanan sinyal sayısı (dosya değişimi + yedek yoklama ortak kullanır)
+_reload_lock = threading.Lock()
+_last_broadcast_count = 0
+
+# Yeni sinyal yayınları bu pencere içinde tek 'new_signals' mesajında birleşir
+BROADCAST_COALESCE_SECONDS = 0.2
+_pending_lock = threading.Lock()
+_pending_signals: list = []
+_flush_scheduled = False
+
+# Sinyal dosyasının stat() ile yoklanma aralığı (watchdog PollingObserver)
+WATCH_POLL_SECONDS = 1.0
+
+
 @app.route('/')
 def index():
     """Serve the main dashboard page."""
@@ -42,14 +94,14 @@ def get_signals():
     try:
         limit = request.args.get('limit', type=int)
         signals = signal_manager.get_all_signals(limit=limit)
-        return jsonify({
+        return ojsonify({
             'success': True,
             'signals': signals,
             'count': len(signals)
         })
     except Exception as e:
         logger.error(f"Error getting signals: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return ojsonify({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/signal', methods=['POST'])
@@ -64,8 +116,8 @@ def receive_signal():
         # Add signal to manager
         signal_manager.add_signal(data)
         
-        # Broadcast to all connected WebSocket clients
-        socketio.emit('new_signal', data)
+        # Broadcast to all connected WebSocket clients (batched)
+        broadcast_new_signal(data)
         
         logger.info(f"✅ Received signal via webhook: {data.get('coin', 'UNKNOWN')}")
         
@@ -81,13 +133,13 @@ def get_latest_signal():
     """REST API: Get the most recent signal."""
     try:
         signal = signal_manager.get_latest_signal()
-        return jsonify({
+        return ojsonify({
             'success': True,
             'signal': signal
         })
     except Exception as e:
         logger.error(f"Error getting latest signal: {e}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -98,13 +150,13 @@ def get_stats():
     """REST API: Get signal statistics."""
     try:
         stats = signal_manager.get_stats()
-        return jsonify({
+        return ojsonify({
             'success': True,
             'stats': stats
         })
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
-        return jsonify({
+        return ojsonify({
             'success': False,
             'error': str(e)
         }), 500
@@ -130,13 +182,102 @@ def handle_request_signals():
     emit('signals_data', {'signals': signals})
 
 
+def _flush_pending_signals():
+    """Emit every signal queued during the coalescing window as one frame."""
+    global _pending_signals, _flush_scheduled
+    
+    socketio.sleep(BROADCAST_COALESCE_SECONDS)
+    with _pending_lock:
+        batch, _pending_signals = _pending_signals, []
+        _flush_scheduled = False
+    
+    if batch:
+        socketio.emit('new_signals', {'signals': batch})
+        logger.info(f"Broadcasted {len(batch)} new signal(s)")
+
+
 def broadcast_new_signal(signal):
     """
     Broadcast a new signal to all connected clients.
     Call this function when a new signal is added.
+    
+    Signals arriving within BROADCAST_COALESCE_SECONDS are sent together
+    as a single 'new_signals' event.
     """
-    socketio.emit('new_signal', {'signal': signal}, broadcast=True)
-    logger.info(f"Broadcasted new signal: {signal.get('coin', 'UNKNOWN')}")
+    global _flush_scheduled
+    
+    with _pending_lock:
+        _pending_signals.append(signal)
+        if _flush_scheduled:
+            return
+        _flush_scheduled = True
+    
+    socketio.start_background_task(_flush_pending_signals)
+
+
+def reload_and_broadcast():
+    """Reload signals from disk and push them to clients if the count changed."""
+    global _last_broadcast_count
+    
+    with _reload_lock:
+        current_count = signal_manager.reload_from_disk()
+        
+        if current_count != _last_broadcast_count:
+            signals = signal_manager.get_all_signals()
+            socketio.emit('signals_data', {'signals': signals})
+            logger.info(f"📡 Broadcasted {current_count} signals to clients")
+            _last_broadcast_count = current_count
+
+
+if WATCHDOG_AVAILABLE:
+    class SignalFileHandler(FileSystemEventHandler):
+        """Triggers a reload when the signal storage file changes on disk."""
+        
+        def __init__(self, storage_path: Path):
+            super().__init__()
+            self.storage_path = storage_path.resolve()
+        
+        def _is_storage_file(self, path: str) -> bool:
+            return Path(path).resolve() == self.storage_path
+        
+        def _reload(self):
+            try:
+                reload_and_broadcast()
+            except Exception as e:
+                logger.error(f"Error reloading signals: {e}")
+        
+        def on_modified(self, event):
+            if not event.is_directory and self._is_storage_file(event.src_path):
+                self._reload()
+        
+        def on_created(self, event):
+            self.on_modified(event)
+        
+        def on_moved(self, event):
+            # Atomik yazma (tmp -> rename) hedef dosyada 'moved' olarak görünür
+            if not event.is_directory and self._is_storage_file(event.dest_path):
+                self._reload()
+
+
+def start_signal_watcher():
+    """
+    Watch the signal storage file and reload on change.
+    
+    Returns:
+        Running PollingObserver, or None if watchdog is not installed
+    """
+    if not WATCHDOG_AVAILABLE:
+        return None
+    
+    observer = PollingObserver(timeout=WATCH_POLL_SECONDS)
+    observer.schedule(
+        SignalFileHandler(signal_manager.storage_path),
+        str(signal_manager.storage_path.parent.resolve()),
+        recursive=False
+    )
+    observer.daemon = True
+    observer.start()
+    return observer
 
 
 def run_dashboard(host='127.0.0.1', port=5000, debug=False):
@@ -148,35 +289,26 @@ def run_dashboard(host='127.0.0.1', port=5000, debug=False):
         port: Port number (default: 5000)
         debug: Enable debug mode
     """
-    # Start background thread to reload signals periodically
-    import threading
-    import time
+    # Dosya değişince anında yeniden yükle; watchdog yoksa eski 5s yoklamaya dön
+    observer = start_signal_watcher()
+    poll_interval = 60 if observer else 5
+    if observer:
+        logger.info(f"✅ Watching {signal_manager.storage_path} for changes")
     
     def reload_signals_loop():
-        """Background thread to reload signals from disk every 5 seconds."""
-        previous_count = 0
+        """Safety-net poll (also drops signals older than 5 hours)."""
         while True:
-            time.sleep(5)
+            socketio.sleep(poll_interval)
             try:
-                # Reload from disk
-                current_count = signal_manager.reload_from_disk()
-                
-                # Broadcast to all connected clients if signals changed
-                if current_count != previous_count:
-                    signals = signal_manager.get_all_signals()
-                    socketio.emit('signals_data', {'signals': signals})
-                    logger.info(f"📡 Broadcasted {current_count} signals to clients")
-                    previous_count = current_count
-                    
+                reload_and_broadcast()
             except Exception as e:
                 logger.error(f"Error reloading signals: {e}")
     
-    reload_thread = threading.Thread(target=reload_signals_loop, daemon=True)
-    reload_thread.start()
-    logger.info("✅ Auto-reload thread started (checks every 5s)")
+    socketio.start_background_task(reload_signals_loop)
+    logger.info(f"✅ Auto-reload task started (checks every {poll_interval}s)")
     
     logger.info(f"🚀 Starting dashboard on http://{host}:{port}")
-    socketio.run(app, host=host, port=port, debug=debug, allow_unsafe_werkzeug=True)
+    socketio.run(app, host=host, port=port, debug=debug)
 
 
 if __name__ == '__main__':
@@ -5,15 +5,21 @@ Now with dynamic token address resolution via DEX Screener.
 """
 
 import asyncio
-import json
 import logging
+import os
+import random
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import aiohttp
+import numpy as np
+import orjson
 
 import config
 from config import (
@@ -22,6 +28,8 @@ from config import (
     BSCSCAN_API_KEY,
     BSCSCAN_API_URL,
     KNOWN_WALLETS_PATH,
+    ADDRESS_CACHE_PATH,
+    ADDRESS_CACHE_TTL_SECONDS,
     TRANSFER_LOOKBACK_COUNT,
     LARGE_TRANSFER_USD,
     WHALE_TRANSFER_CONFIDENCE_BOOST,
@@ -32,6 +40,29 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
+# Oturum varsayılanı Etherscan'e göre; daha kısa/uzun isteyen çağrılar kendi nesnesini verir
+_SESSION_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10)
+_DEXSCREENER_TIMEOUT = aiohttp.ClientTimeout(total=10)
+_SOLSCAN_TIMEOUT = aiohttp.ClientTimeout(total=20)
+_USER_AGENT = "coin-signal/1.0"
+
+# DEX Screener zincir adları
+_CHAIN_ALIAS = {
+    "ethereum": "ethereum",
+    "bsc": "bsc",
+    "eth": "ethereum",
+    "binance": "bsc"
+}
+_ETH_ALIASES = frozenset({"ethereum", "eth"})
+
+# Etherscan V2 için Chain ID Haritası
+_EVM_CHAIN_ID = {
+    "ethereum": "1", "eth": "1",
+    "bsc": "56", "binance": "56",
+    "base": "8453", "avalanche": "43114", "avax": "43114",
+    "polygon": "137", "arbitrum": "42161", "optimism": "10", "fantom": "250"
+}
+
 
 class SignalType(Enum):
     """Trading signal type based on on-chain analysis."""
@@ -49,7 +80,62 @@ class WalletType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# TransferBatch sütunlarında cüzdan türü int8 kod olarak tutulur
+_WALLET_CODE = {
+    WalletType.UNKNOWN: 0,
+    WalletType.WHALE: 1,
+    WalletType.EXCHANGE: 2,
+    WalletType.MARKET_MAKER: 3
+}
+_WHALE = _WALLET_CODE[WalletType.WHALE]
+_EXCHANGE = _WALLET_CODE[WalletType.EXCHANGE]
+_MARKET_MAKER = _WALLET_CODE[WalletType.MARKET_MAKER]
+
+# known_wallets.json grupları, eşleşme önceliği sırasıyla
+_WALLET_GROUPS = (
+    ("whales", WalletType.WHALE),
+    ("exchanges", WalletType.EXCHANGE),
+    ("market_makers", WalletType.MARKET_MAKER)
+)
+_UNKNOWN_WALLET = (WalletType.UNKNOWN, "Unknown")
+
+# Aynı token kısa sürede tekrar incelenirse Etherscan/Solscan'e yeniden gidilmez
+_TRANSFER_CACHE_TTL = 60.0
+_TRANSFER_CACHE_SIZE = 256
+
+# Rate limit (429 / Etherscan "Max rate limit reached") sonrası bekleme: (taban, üst sınır) saniye.
+# Her ardışık ihlalde süre ikiye katlanır; %10'a kadar rastgele sapma eklenir.
+_RATE_LIMIT_BACKOFF = {
+    "etherscan": (2.0, 60.0),
+    "solscan": (60.0, 900.0)
+}
+
+# OnChainSignal en fazla 5 kanıt taşır; fazlası için satır üretmeye gerek yok
+_MAX_EVIDENCE = 5
+
+
+def _fmt_amount(value_usd: float, value: float) -> str:
+    """Evidence amount: USD when a price is known, otherwise raw tokens."""
+    return f"${value_usd:,.0f}" if value_usd else f"{value:,.2f} tokens"
+
+
+# Sinyal türü -> gösterim (her property erişiminde yeni dict kurulmasın)
+_BIAS_EMOJI = {
+    SignalType.LONG: "🟢",
+    SignalType.SHORT: "🔴",
+    SignalType.VOLATILITY: "🟡",
+    SignalType.NEUTRAL: "⚪"
+}
+
+_BIAS_TEXT = {
+    SignalType.LONG: "LONG (Bullish)",
+    SignalType.SHORT: "SHORT (Bearish)",
+    SignalType.VOLATILITY: "VOLATILITY",
+    SignalType.NEUTRAL: "NEUTRAL"
+}
+
+
+@dataclass(slots=True)
 class Transfer:
     """Represents an ERC-20 transfer event."""
     tx_hash: str
@@ -57,14 +143,43 @@ class Transfer:
     to_address: str
     value: float
     value_usd: float
-    timestamp: datetime
+    timestamp_unix: float  # Unix saniye (API'den geldiği gibi)
     from_type: WalletType = WalletType.UNKNOWN
     to_type: WalletType = WalletType.UNKNOWN
     from_label: str = "Unknown"
     to_label: str = "Unknown"
 
+    @property
+    def timestamp(self) -> datetime:
+        """Local datetime, built only when displayed."""
+        return datetime.fromtimestamp(self.timestamp_unix)
+
+
+@dataclass(slots=True)
+class TransferBatch:
+    """
+    Column-oriented (SoA) view of a transfer window for vectorized scoring.
+
+    Transfer nesneleri yalnızca kanıt satırları için kullanılır; sayımlar ve
+    toplamlar bu dizilerden tek NumPy indirgemesiyle hesaplanır.
+    """
+    value: np.ndarray      # float64, token miktarı
+    timestamp: np.ndarray  # float64, Unix saniye
+    from_code: np.ndarray  # int8, _WALLET_CODE
+    to_code: np.ndarray    # int8, _WALLET_CODE
+
+    @classmethod
+    def from_transfers(cls, transfers: List[Transfer]) -> "TransferBatch":
+        n = len(transfers)
+        return cls(
+            value=np.fromiter((t.value for t in transfers), dtype=np.float64, count=n),
+            timestamp=np.fromiter((t.timestamp_unix for t in transfers), dtype=np.float64, count=n),
+            from_code=np.fromiter((_WALLET_CODE[t.from_type] for t in transfers), dtype=np.int8, count=n),
+            to_code=np.fromiter((_WALLET_CODE[t.to_type] for t in transfers), dtype=np.int8, count=n)
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class OnChainSignal:
     """Result of on-chain analysis."""
     signal_type: SignalType
@@ -79,21 +194,86 @@ class OnChainSignal:
 
     @property
     def bias_emoji(self) -> str:
-        return {
-            SignalType.LONG: "🟢",
-            SignalType.SHORT: "🔴",
-            SignalType.VOLATILITY: "🟡",
-            SignalType.NEUTRAL: "⚪"
-        }.get(self.signal_type, "⚪")
+        return _BIAS_EMOJI.get(self.signal_type, "⚪")
 
     @property
     def bias_text(self) -> str:
-        return {
-            SignalType.LONG: "LONG (Bullish)",
-            SignalType.SHORT: "SHORT (Bearish)",
-            SignalType.VOLATILITY: "VOLATILITY",
-            SignalType.NEUTRAL: "NEUTRAL"
-        }.get(self.signal_type, "NEUTRAL")
+        return _BIAS_TEXT.get(self.signal_type, "NEUTRAL")
+
+
+# =============================================================================
+# TRANSFER PARSERS
+# =============================================================================
+_Classifier = Callable[[str], Tuple[WalletType, str]]
+
+
+def _parse_evm_tx(tx: Dict, classify: _Classifier) -> Optional[Transfer]:
+    """
+    Parse one Etherscan tokentx row; malformed rows return None.
+    
+    Yalnızca sayısal dönüşümler korunur; eksik alanlar eskisi gibi
+    varsayılan değerlerle doldurulur.
+    """
+    if not isinstance(tx, dict):
+        return None
+    
+    try:
+        decimals = int(tx.get("tokenDecimal", 18))
+        value = int(tx.get("value", 0)) / (10 ** decimals)
+        timestamp_unix = int(tx.get("timeStamp", 0))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    
+    from_addr = tx.get("from") or ""
+    to_addr = tx.get("to") or ""
+    from_type, from_label = classify(from_addr)
+    to_type, to_label = classify(to_addr)
+    
+    return Transfer(
+        tx_hash=tx.get("hash", ""),
+        from_address=from_addr,
+        to_address=to_addr,
+        value=value,
+        value_usd=0,
+        timestamp_unix=timestamp_unix,
+        from_type=from_type,
+        to_type=to_type,
+        from_label=from_label,
+        to_label=to_label
+    )
+
+
+def _parse_solana_tx(tx: Dict, classify: _Classifier) -> Optional[Transfer]:
+    """Parse one Solscan token transfer row; malformed rows return None."""
+    if not isinstance(tx, dict):
+        return None
+    
+    try:
+        # Solana'da decimal genelde API'den gelir veya 9'dur (SOL)
+        decimals = int(tx.get("tokenDecimals", 9))
+        value = int(tx.get("amount", 0)) / (10 ** decimals)
+        # Zaman damgası (Unix)
+        timestamp_unix = int(tx.get("blockTime", 0))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    
+    from_addr = tx.get("fromUserAccount") or ""
+    to_addr = tx.get("toUserAccount") or ""
+    from_type, from_label = classify(from_addr)
+    to_type, to_label = classify(to_addr)
+    
+    return Transfer(
+        tx_hash=tx.get("_id", ""),
+        from_address=from_addr,
+        to_address=to_addr,
+        value=value,
+        value_usd=0,
+        timestamp_unix=timestamp_unix,
+        from_type=from_type,
+        to_type=to_type,
+        from_label=from_label,
+        to_label=to_label
+    )
 
 
 # =============================================================================
@@ -120,10 +300,15 @@ async def resolve_token_address(
     Returns:
         Tuple of (address, chain) or (None, chain)
     """
-    symbol_clean = symbol.upper().replace("1000", "").replace("1000000", "")
+    # Binance çarpanlı kontratlar: 1000PEPE, 1000000MOG -> PEPE, MOG (yalnızca önek)
+    symbol_clean = symbol.upper()
+    if symbol_clean.startswith("1000000"):
+        symbol_clean = symbol_clean[7:]
+    elif symbol_clean.startswith("1000"):
+        symbol_clean = symbol_clean[4:]
     
-    if symbol_clean in TOKEN_ADDRESSES:
-        addresses = TOKEN_ADDRESSES[symbol_clean]
+    addresses = TOKEN_ADDRESSES.get(symbol_clean)
+    if addresses:
         if chain in addresses:
             logger.info(f"✅ {symbol_clean} address found in config (cache hit)")
             return addresses[chain], chain
@@ -135,45 +320,42 @@ async def resolve_token_address(
     
     try:
         url = f"https://api.dexscreener.com/latest/dex/search?q={symbol_clean}"
-        async with session.get(url, timeout=10) as response:
+        async with session.get(url, timeout=_DEXSCREENER_TIMEOUT) as response:
             if response.status != 200:
                 logger.warning(f"DEX Screener API error: {response.status}")
                 return None, chain
             
-            data = await response.json()
+            data = orjson.loads(await response.read())
             pairs = data.get("pairs", [])
             
             if not pairs:
                 logger.warning(f"No pairs found for {symbol_clean}")
                 return None, chain
 
-            best_pair = None
-            max_liquidity = 0.0
-            
-            chain_mapping = {
-                "ethereum": "ethereum",
-                "bsc": "bsc",
-                "eth": "ethereum",
-                "binance": "bsc"
-            }
-            target_chain = chain_mapping.get(chain.lower(), chain)
+            target_chain = _CHAIN_ALIAS.get(chain.lower(), chain)
+            match_eth_aliases = chain == "ethereum"
 
+            # Tek geçiş: hedef zincirdeki en likit çift ve yedek olarak herhangi bir zincirdeki en likit çift
+            best_on_chain, liquidity_on_chain = None, 0.0
+            best_any, liquidity_any = None, 0.0
             for pair in pairs:
-                pair_chain = pair.get("chainId", "").lower()
+                try:
+                    liquidity = float((pair.get("liquidity") or {}).get("usd") or 0)
+                except (TypeError, ValueError):
+                    continue
+                
+                if liquidity > liquidity_any:
+                    best_any, liquidity_any = pair, liquidity
                 
-                if pair_chain == target_chain or (chain == "ethereum" and pair_chain in ["ethereum", "eth"]):
-                    liquidity = float(pair.get("liquidity", {}).get("usd", 0) or 0)
-                    
-                    if liquidity > max_liquidity:
-                        max_liquidity = liquidity
-                        best_pair = pair
-
-            if not best_pair:
-                for pair in pairs:
-                    liquidity = float(pair.get("liquidity", {}).get("usd", 0) or 0)
-                    if liquidity > max_liquidity:
-                        max_liquidity = liquidity
-                        best_pair = pair
+                pair_chain = (pair.get("chainId") or "").lower()
+                if (pair_chain == target_chain or (match_eth_aliases and pair_chain in _ETH_ALIASES)) \
+                        and liquidity > liquidity_on_chain:
+                    best_on_chain, liquidity_on_chain = pair, liquidity
+
+            if best_on_chain:
+                best_pair, max_liquidity = best_on_chain, liquidity_on_chain
+            else:
+                best_pair, max_liquidity = best_any, liquidity_any
 
             if best_pair and max_liquidity > 50000:
                 address = best_pair.get("baseToken", {}).get("address")
@@ -195,6 +377,41 @@ async def resolve_token_address(
         return None, chain
 
 
+@lru_cache(maxsize=4)
+def _build_wallet_index(path: str, mtime_ns: Optional[int]) -> Dict[str, Tuple[WalletType, str]]:
+    """
+    Parse known_wallets.json into a flat index keyed by lowercase address.
+    
+    Adresler yükleme sırasında bir kez küçük harfe çevrilir; sınıflandırma
+    tek dict erişimi olur. Aynı adres birden fazla grupta varsa whale >
+    exchange > market maker önceliği korunur. `mtime_ns` yalnızca önbellek
+    anahtarıdır: dosya değişince yeniden okunur.
+    """
+    index: Dict[str, Tuple[WalletType, str]] = {}
+    if mtime_ns is None:
+        return index
+    try:
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+        for group, wallet_type in _WALLET_GROUPS:
+            for addr, label in data.get(group, {}).items():
+                index.setdefault(addr.lower(), (wallet_type, label))
+        logger.info(f"Loaded {sum(len(v) for v in data.values())} known wallets")
+    except Exception as e:
+        logger.error(f"Failed to load known wallets: {e}")
+    
+    return index
+
+
+def _load_wallet_index(path: str) -> Dict[str, Tuple[WalletType, str]]:
+    """Return the shared wallet index for `path`, re-parsing only if the file changed."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _build_wallet_index(path, mtime_ns)
+
+
 class OnChainInspector:
     """
     Analyzes on-chain ERC-20 transfers to detect whale/exchange movements.
@@ -206,28 +423,70 @@ class OnChainInspector:
     """
 
     def __init__(self):
-        self.known_wallets: Dict[str, Dict[str, str]] = self._load_known_wallets()
+        self._wallet_index = _load_wallet_index(KNOWN_WALLETS_PATH)
         self._session: Optional[aiohttp.ClientSession] = None
         self._address_cache: Dict[str, Tuple[Optional[str], str]] = {}
-
-    def _load_known_wallets(self) -> Dict[str, Dict[str, str]]:
-        """Load known wallet addresses from JSON file."""
+        # (token_address, chain, limit) -> (monotonic zaman, transferler); LRU sırasıyla
+        # API adı -> monotonic bekleme bitişi / ardışık rate limit sayısı
+        self._cooldown_until: Dict[str, float] = {}
+        self._rate_limit_hits: Dict[str, int] = {}
+        self._transfer_cache: "OrderedDict[Tuple[str, str, int], Tuple[float, List[Transfer]]]" = OrderedDict()
+        # Disk önbelleği: yalnızca bulunan adresler, {key: {address, chain, ts}}
+        self._disk_cache_path = Path(ADDRESS_CACHE_PATH)
+        self._disk_cache: Dict[str, Dict] = self._load_address_cache()
+        self._disk_cache_lock = asyncio.Lock()
+        for key, entry in self._disk_cache.items():
+            self._address_cache[key] = (entry["address"], entry["chain"])
+
+    def _load_address_cache(self) -> Dict[str, Dict]:
+        """Load non-expired address resolutions from disk."""
         try:
-            path = Path(KNOWN_WALLETS_PATH)
-            if path.exists():
-                with open(path, 'r') as f:
-                    data = json.load(f)
-                    logger.info(f"Loaded {sum(len(v) for v in data.values())} known wallets")
-                    return data
+            if self._disk_cache_path.exists():
+                data = orjson.loads(self._disk_cache_path.read_bytes())
+                cutoff = time.time() - ADDRESS_CACHE_TTL_SECONDS
+                fresh = {k: v for k, v in data.items() if v.get("ts", 0) > cutoff and v.get("address")}
+                logger.info(f"Loaded {len(fresh)} cached token addresses")
+                return fresh
         except Exception as e:
-            logger.error(f"Failed to load known wallets: {e}")
-        
-        return {"whales": {}, "exchanges": {}, "market_makers": {}}
+            logger.error(f"Failed to load address cache: {e}")
+        return {}
+
+    def _write_address_cache(self, entries: Dict[str, Dict]) -> None:
+        """Atomically write the address cache (runs in a worker thread)."""
+        self._disk_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._disk_cache_path.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps(entries))
+        os.replace(tmp_path, self._disk_cache_path)
+
+    async def _persist_address(self, cache_key: str, address: str, chain: str) -> None:
+        """Record a resolved address and flush the cache file off the event loop."""
+        async with self._disk_cache_lock:
+            self._disk_cache[cache_key] = {"address": address, "chain": chain, "ts": time.time()}
+            try:
+                await asyncio.to_thread(self._write_address_cache, dict(self._disk_cache))
+            except Exception as e:
+                logger.error(f"Failed to save address cache: {e}")
 
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
+        """
+        Get or create the shared aiohttp session.
+        
+        Tüm DEX Screener / Etherscan / Solscan çağrıları bu oturumu kullanır;
+        bağlantılar 60 sn açık tutulur ve DNS sonuçları 5 dk önbelleklenir.
+        """
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=50,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=_SESSION_TIMEOUT,
+                headers={"User-Agent": _USER_AGENT}
+            )
         return self._session
 
     async def close(self):
@@ -245,6 +504,10 @@ class OnChainInspector:
         """
         Resolve token address with caching.
         
+        Bulunan adresler ADDRESS_CACHE_PATH'e de yazılır ve
+        ADDRESS_CACHE_TTL_SECONDS boyunca yeniden başlatmalarda geçerlidir.
+        Bulunamayanlar yalnızca bellekte tutulur (geçici hata olabilir).
+        
         Args:
             symbol: Token symbol
             chain: Target blockchain
@@ -259,8 +522,47 @@ class OnChainInspector:
         session = await self._get_session()
         result = await resolve_token_address(session, symbol, chain)
         self._address_cache[cache_key] = result
+        
+        address, resolved_chain = result
+        if address:
+            await self._persist_address(cache_key, address, resolved_chain)
         return result
 
+    def _in_cooldown(self, api: str) -> bool:
+        """True while a rate-limited API should not be called."""
+        return time.monotonic() < self._cooldown_until.get(api, 0.0)
+
+    def _note_rate_limited(self, api: str) -> float:
+        """Start (or extend) an exponential back-off with jitter; returns the delay."""
+        base, cap = _RATE_LIMIT_BACKOFF[api]
+        hits = self._rate_limit_hits.get(api, 0)
+        delay = min(base * 2 ** hits, cap)
+        delay += random.uniform(0, delay * 0.1)
+        self._rate_limit_hits[api] = hits + 1
+        self._cooldown_until[api] = time.monotonic() + delay
+        return delay
+
+    def _note_success(self, api: str) -> None:
+        self._rate_limit_hits.pop(api, None)
+
+    def _get_cached_transfers(self, key: Tuple[str, str, int]) -> Optional[List[Transfer]]:
+        """Return transfers fetched within the TTL, refreshing their LRU position."""
+        hit = self._transfer_cache.get(key)
+        if hit is None:
+            return None
+        if time.monotonic() - hit[0] >= _TRANSFER_CACHE_TTL:
+            del self._transfer_cache[key]
+            return None
+        self._transfer_cache.move_to_end(key)
+        return hit[1]
+
+    def _store_transfers(self, key: Tuple[str, str, int], transfers: List[Transfer]) -> None:
+        """Cache a successful fetch, evicting the least recently used entry when full."""
+        self._transfer_cache[key] = (time.monotonic(), transfers)
+        self._transfer_cache.move_to_end(key)
+        if len(self._transfer_cache) > _TRANSFER_CACHE_SIZE:
+            self._transfer_cache.popitem(last=False)
+
     def _classify_wallet(self, address: str) -> Tuple[WalletType, str]:
         """
         Classify a wallet address based on known_wallets.json.
@@ -268,21 +570,7 @@ class OnChainInspector:
         Returns:
             Tuple of (WalletType, label)
         """
-        addr_lower = address.lower()
-        
-        for addr, label in self.known_wallets.get("whales", {}).items():
-            if addr.lower() == addr_lower:
-                return WalletType.WHALE, label
-        
-        for addr, label in self.known_wallets.get("exchanges", {}).items():
-            if addr.lower() == addr_lower:
-                return WalletType.EXCHANGE, label
-        
-        for addr, label in self.known_wallets.get("market_makers", {}).items():
-            if addr.lower() == addr_lower:
-                return WalletType.MARKET_MAKER, label
-        
-        return WalletType.UNKNOWN, "Unknown"
+        return self._wallet_index.get(address.lower(), _UNKNOWN_WALLET)
 
     # -------------------------------------------------------------
     # GÜNCELLENMİŞ TRANSFER ÇEKME FONKSİYONU (SOLANA DESTEKLİ)
@@ -295,30 +583,36 @@ class OnChainInspector:
     ) -> List[Transfer]:
         """
         Fetch transfers from EVM chains (Etherscan) AND Solana (Solscan).
+        
+        Başarılı sonuçlar _TRANSFER_CACHE_TTL saniye önbelleklenir. Dönen liste
+        önbellekle paylaşılır; çağıranlar içeriğini değiştirmemelidir.
         """
         chain_key = chain.lower()
+        cache_key = (token_address, chain_key, limit)
+        cached = self._get_cached_transfers(cache_key)
+        if cached is not None:
+            return cached
 
         # >>> SOLANA YÖNLENDİRMESİ <<<
         if chain_key == "solana":
-            return await self.fetch_solana_transfers(token_address, limit)
+            transfers = await self.fetch_solana_transfers(token_address, limit)
+            if transfers:
+                self._store_transfers(cache_key, transfers)
+            return transfers
 
         # ... EVM (Ethereum/BSC/Base vs) MANTIĞI ...
-        # Etherscan V2 için Chain ID Haritası
-        CHAIN_MAP = {
-            "ethereum": "1", "eth": "1",
-            "bsc": "56", "binance": "56",
-            "base": "8453", "avalanche": "43114", "avax": "43114",
-            "polygon": "137", "arbitrum": "42161", "optimism": "10", "fantom": "250"
-        }
-
-        if chain_key not in CHAIN_MAP:
+        chain_id = _EVM_CHAIN_ID.get(chain_key)
+        if chain_id is None:
             logger.info(f"⏭️ Skipping {chain} (Not supported yet)")
             return []
 
-        chain_id = CHAIN_MAP[chain_key]
         api_url = ETHERSCAN_API_URL
         api_key = ETHERSCAN_API_KEY
 
+        if self._in_cooldown("etherscan"):
+            logger.debug("Etherscan cooling down after rate limit, skipping")
+            return []
+
         params = {
             "chainid": chain_id,
             "module": "account",
@@ -332,37 +626,32 @@ class OnChainInspector:
 
         try:
             session = await self._get_session()
-            async with session.get(api_url, params=params, timeout=30) as resp:
+            async with session.get(api_url, params=params) as resp:
+                if resp.status == 429:
+                    delay = self._note_rate_limited("etherscan")
+                    logger.warning(f"⚠️ Etherscan Rate Limit (HTTP 429). Backing off {delay:.0f}s.")
+                    return []
                 if resp.status != 200: return []
-                data = await resp.json()
+                # Ham gövdeyi orjson ile çöz (resp.json() stdlib json kullanır)
+                data = orjson.loads(await resp.read())
                 
-                if data.get("status") != "1": return []
+                if data.get("status") != "1":
+                    # "No transactions found" da status 0 döner; yalnızca rate limit mesajında bekle
+                    if "rate limit" in str(data.get("result", "")).lower():
+                        delay = self._note_rate_limited("etherscan")
+                        logger.warning(f"⚠️ Etherscan Rate Limit ({data.get('result')}). Backing off {delay:.1f}s.")
+                    return []
+                self._note_success("etherscan")
                 
-                transfers = []
-                for tx in data.get("result", []):
-                    try:
-                        decimals = int(tx.get("tokenDecimal", 18))
-                        value = int(tx.get("value", 0)) / (10 ** decimals)
-                        timestamp = datetime.fromtimestamp(int(tx.get("timeStamp", 0)))
-                        
-                        from_type, from_label = self._classify_wallet(tx.get("from", ""))
-                        to_type, to_label = self._classify_wallet(tx.get("to", ""))
-                        
-                        transfers.append(Transfer(
-                            tx_hash=tx.get("hash", ""),
-                            from_address=tx.get("from", ""),
-                            to_address=tx.get("to", ""),
-                            value=value,
-                            value_usd=0,
-                            timestamp=timestamp,
-                            from_type=from_type,
-                            to_type=to_type,
-                            from_label=from_label,
-                            to_label=to_label
-                        ))
-                    except: continue
+                classify = self._classify_wallet
+                transfers = [
+                    t for t in (_parse_evm_tx(tx, classify) for tx in data.get("result") or [])
+                    if t is not None
+                ]
                 
                 logger.info(f"Fetched {len(transfers)} transfers for {token_address[:10]}... (Chain: {chain})")
+                if transfers:
+                    self._store_transfers(cache_key, transfers)
                 return transfers
         except Exception as e:
             logger.error(f"EVM Fetch Error: {e}")
@@ -375,55 +664,35 @@ class OnChainInspector:
         """
         Fetch Solana SPL token transfers via Solscan Public API.
         """
+        if self._in_cooldown("solscan"):
+            logger.debug("Solscan cooling down after rate limit, skipping")
+            return []
+        
         # Solscan Public API Endpoint
         url = f"https://public-api.solscan.io/transfer/token?token_address={token_address}&limit={limit}&offset=0"
         
         try:
             session = await self._get_session()
             # Solana API bazen yavaştır, timeout uzun tutuldu
-            async with session.get(url, timeout=20) as resp:
+            async with session.get(url, timeout=_SOLSCAN_TIMEOUT) as resp:
                 if resp.status == 429:
-                    logger.warning("⚠️ Solscan Rate Limit (Too many requests). Skipping Solana for this cycle.")
+                    delay = self._note_rate_limited("solscan")
+                    logger.warning(f"⚠️ Solscan Rate Limit (Too many requests). Backing off {delay:.0f}s.")
                     return []
                 if resp.status != 200:
                     logger.error(f"Solscan API Error: {resp.status}")
                     return []
+                self._note_success("solscan")
 
-                data = await resp.json()
+                data = orjson.loads(await resp.read())
                 # Solscan yapısı farklıdır: {'data': [...]}
-                tx_list = data.get("data", [])
+                tx_list = data.get("data") or []
                 
-                transfers = []
-                for tx in tx_list:
-                    try:
-                        # Solana'da decimal genelde API'den gelir veya 9'dur (SOL)
-                        decimals = int(tx.get("tokenDecimals", 9))
-                        amount_raw = int(tx.get("amount", 0))
-                        value = amount_raw / (10 ** decimals)
-                        
-                        # Zaman damgası (Unix)
-                        timestamp = datetime.fromtimestamp(tx.get("blockTime", 0))
-                        
-                        from_addr = tx.get("fromUserAccount", "")
-                        to_addr = tx.get("toUserAccount", "")
-                        
-                        from_type, from_label = self._classify_wallet(from_addr)
-                        to_type, to_label = self._classify_wallet(to_addr)
-
-                        transfers.append(Transfer(
-                            tx_hash=tx.get("_id", ""),
-                            from_address=from_addr,
-                            to_address=to_addr,
-                            value=value,
-                            value_usd=0,
-                            timestamp=timestamp,
-                            from_type=from_type,
-                            to_type=to_type,
-                            from_label=from_label,
-                            to_label=to_label
-                        ))
-                    except Exception as e:
-                        continue
+                classify = self._classify_wallet
+                transfers = [
+                    t for t in (_parse_solana_tx(tx, classify) for tx in tx_list)
+                    if t is not None
+                ]
                 
                 logger.info(f"🌞 Fetched {len(transfers)} SOLANA transfers for {token_address[:10]}...")
                 return transfers
@@ -455,44 +724,55 @@ class OnChainInspector:
                 analyzed_transfers=0
             )
 
-        evidence = []
-        base_confidence = 50
-        
-        whale_to_exchange_count = 0
-        whale_to_exchange_value = 0.0
-        exchange_to_whale_count = 0
-        exchange_to_whale_value = 0.0
-        market_maker_moves = 0
-        recent_whale_activity = 0
-
-        one_hour_ago = datetime.now() - timedelta(hours=1)
-
-        for transfer in transfers:
-            if current_price > 0:
-                transfer.value_usd = transfer.value * current_price
-
-            if transfer.from_type == WalletType.WHALE and transfer.to_type == WalletType.EXCHANGE:
-                whale_to_exchange_count += 1
-                whale_to_exchange_value += transfer.value_usd or transfer.value
-                evidence.append(
-                    f"🔴 {transfer.from_label} → {transfer.to_label}: "
-                    f"${transfer.value_usd:,.0f}" if transfer.value_usd else f"{transfer.value:,.2f} tokens"
-                )
+        # Bilinen cüzdan yoksa (seyrek known_wallets) sayımların hepsi sıfır çıkar;
+        # hesaplanan yolla birebir aynı sonucu (NEUTRAL, 50 - 30 -> 20, kanıt yok)
+        # dizi kurmadan döndür
+        unknown = WalletType.UNKNOWN
+        if all(t.from_type is unknown and t.to_type is unknown for t in transfers):
+            return OnChainSignal(
+                signal_type=SignalType.NEUTRAL,
+                confidence_score=20,
+                evidence=[],
+                analyzed_transfers=len(transfers)
+            )
 
-            elif transfer.from_type == WalletType.EXCHANGE and transfer.to_type == WalletType.WHALE:
-                exchange_to_whale_count += 1
-                exchange_to_whale_value += transfer.value_usd or transfer.value
-                evidence.append(
-                    f"🟢 {transfer.from_label} → {transfer.to_label}: "
-                    f"${transfer.value_usd:,.0f}" if transfer.value_usd else f"{transfer.value:,.2f} tokens"
-                )
+        details: List[str] = []
+        summary: Optional[str] = None
+        base_confidence = 50
 
-            if transfer.from_type == WalletType.MARKET_MAKER or transfer.to_type == WalletType.MARKET_MAKER:
-                market_maker_moves += 1
+        batch = TransferBatch.from_transfers(transfers)
+        from_code, to_code = batch.from_code, batch.to_code
 
-            if transfer.from_type == WalletType.WHALE or transfer.to_type == WalletType.WHALE:
-                if transfer.timestamp > one_hour_ago:
-                    recent_whale_activity += 1
+        # Fiyat yoksa toplamlar token miktarı üzerinden yapılır
+        if current_price > 0:
+            value_usd = batch.value * current_price
+            amounts = value_usd
+        else:
+            value_usd = np.zeros_like(batch.value)
+            amounts = batch.value
+
+        whale_to_exchange = (from_code == _WHALE) & (to_code == _EXCHANGE)
+        exchange_to_whale = (from_code == _EXCHANGE) & (to_code == _WHALE)
+        whale_involved = (from_code == _WHALE) | (to_code == _WHALE)
+
+        whale_to_exchange_count = int(np.count_nonzero(whale_to_exchange))
+        whale_to_exchange_value = float(amounts[whale_to_exchange].sum())
+        exchange_to_whale_count = int(np.count_nonzero(exchange_to_whale))
+        exchange_to_whale_value = float(amounts[exchange_to_whale].sum())
+        market_maker_moves = int(np.count_nonzero((from_code == _MARKET_MAKER) | (to_code == _MARKET_MAKER)))
+
+        one_hour_ago = time.time() - 3600
+        recent_whale_activity = int(np.count_nonzero(whale_involved & (batch.timestamp > one_hour_ago)))
+
+        # Kanıt satırları yalnızca balina<->borsa transferleri için (genelde birkaç tane)
+        flagged = np.flatnonzero(whale_to_exchange | exchange_to_whale)[:_MAX_EVIDENCE]
+        for i in flagged:
+            transfer = transfers[i]
+            marker = "🔴" if whale_to_exchange[i] else "🟢"
+            details.append(
+                f"{marker} {transfer.from_label} → {transfer.to_label}: "
+                f"{_fmt_amount(value_usd[i], transfer.value)}"
+            )
 
         confidence = base_confidence
         confidence += min(whale_to_exchange_count * WHALE_TRANSFER_CONFIDENCE_BOOST, 40)
@@ -509,23 +789,29 @@ class OnChainInspector:
 
         if market_maker_moves >= 3:
             signal_type = SignalType.VOLATILITY
-            evidence.insert(0, f"⚠️ High Market Maker activity detected ({market_maker_moves} moves)")
+            summary = f"⚠️ High Market Maker activity detected ({market_maker_moves} moves)"
         elif whale_to_exchange_count > exchange_to_whale_count:
             signal_type = SignalType.SHORT
-            evidence.insert(0, f"📉 {whale_to_exchange_count} whale deposits to exchanges detected")
+            summary = f"📉 {whale_to_exchange_count} whale deposits to exchanges detected"
         elif exchange_to_whale_count > whale_to_exchange_count:
             signal_type = SignalType.LONG
-            evidence.insert(0, f"📈 {exchange_to_whale_count} whale withdrawals from exchanges detected")
+            summary = f"📈 {exchange_to_whale_count} whale withdrawals from exchanges detected"
         elif whale_to_exchange_count == exchange_to_whale_count and whale_to_exchange_count > 0:
             signal_type = SignalType.VOLATILITY
         else:
             signal_type = SignalType.NEUTRAL
             confidence = max(confidence - 30, 20)
 
+        # Özet satırı (varsa) başta, toplam en fazla _MAX_EVIDENCE satır
+        if summary:
+            evidence = [summary] + details[:_MAX_EVIDENCE - 1]
+        else:
+            evidence = details
+
         return OnChainSignal(
             signal_type=signal_type,
             confidence_score=confidence,
-            evidence=evidence[:5],
+            evidence=evidence,
             whale_transfers=whale_to_exchange_count + exchange_to_whale_count,
             exchange_deposits=whale_to_exchange_value,
             exchange_withdrawals=exchange_to_whale_value,
@@ -583,6 +869,29 @@ class OnChainInspector:
         
         return await self.inspect(token_address, resolved_chain, current_price)
 
+    async def inspect_many(
+        self,
+        jobs: List[Tuple[str, str, float]],
+        concurrency: int = 8
+    ) -> List[Tuple[str, OnChainSignal]]:
+        """
+        Inspect several symbols concurrently.
+        
+        Args:
+            jobs: (symbol, chain, current_price) tuples
+            concurrency: Max in-flight inspections (keep <= connector limit_per_host)
+            
+        Returns:
+            (symbol, OnChainSignal) tuples in the same order as jobs
+        """
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def one(symbol: str, chain: str, current_price: float):
+            async with sem:
+                return symbol, await self.inspect_by_symbol(symbol, chain, current_price)
+        
+        return await asyncio.gather(*(one(*job) for job in jobs))
+
 
 async def test_inspector():
     """Test the inspector with dynamic address resolution."""
@@ -591,13 +900,18 @@ async def test_inspector():
     test_symbols = ["ETH", "PEPE", "SHIB", "DOGE"]
     
     async with OnChainInspector() as inspector:
-        for symbol in test_symbols:
+        async def inspect_one(symbol: str):
+            return symbol, await inspector.inspect_by_symbol(symbol, "ethereum", current_price=0)
+        
+        # Sonuçlar istek sırasıyla değil, tamamlandıkça yazdırılır
+        tasks = [asyncio.create_task(inspect_one(symbol)) for symbol in test_symbols]
+        for next_done in asyncio.as_completed(tasks):
+            symbol, signal = await next_done
+            
             print(f"\n{'='*60}")
             print(f"🔍 ON-CHAIN ANALYSIS: {symbol}")
             print(f"{'='*60}")
             
-            signal = await inspector.inspect_by_symbol(symbol, "ethereum", current_price=0)
-            
             print(f"Signal: {signal.bias_emoji} {signal.bias_text}")
             print(f"Confidence: {signal.confidence_score}%")
             print(f"Transfers Analyzed: {signal.analyzed_transfers}")
@@ -606,8 +920,6 @@ async def test_inspector():
                 print("Evidence:")
                 for e in signal.evidence:
                     print(f"  • {e}")
-            
-            await asyncio.sleep(0.5)
 
 
 if __name__ == "__main__":
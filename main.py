@@ -5,13 +5,22 @@ Async loop that runs Scanner -> Inspector -> Telegram Alert.
 
 import asyncio
 import logging
+import math
 import signal as os_signal
 import sys
+import time
 from datetime import datetime
 from typing import Optional
 import ccxt.async_support as ccxt
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    # Windows vb. platformlarda standart asyncio döngüsüyle devam
+    UVLOOP_AVAILABLE = False
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -22,11 +31,11 @@ from config import (
     TELEGRAM_BOT_TOKEN,
     TELEGRAM_CHAT_ID
 )
-from scanner import BinanceFuturesScanner, ScanResult
+from scanner import BinanceFuturesScanner, ScanResult, base_asset_from_symbol
 from inspector import OnChainInspector, OnChainSignal, SignalType
 from bot_interface import TelegramReporter
 from analyzer import get_advanced_analysis
-from signal_manager import SignalManager
+from signal_manager import DashboardSignal, SignalManager
 
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL, logging.INFO),
@@ -41,6 +50,39 @@ logger = logging.getLogger(__name__)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("telegram").setLevel(logging.WARNING)
 
+# Sinyal başına yeniden kurulmayan link şablonları
+_TV_LINK_TMPL = "https://www.tradingview.com/chart/?symbol=BINANCE%3A{}USDT.P"
+_BINANCE_LINK_TMPL = "https://www.binance.com/en/futures/{}USDT"
+
+# Sembol başına uyarı bekleme süresi; 2 katından eski kayıtlar silinir
+_ALERT_COOLDOWN_SECONDS = 300
+_COOLDOWN_SWEEP_EVERY = 100  # tarama döngüsü
+
+# Fiyat formatı büyüklük mertebesine göre: floor(log10(fiyat)) + 3, [0, 3] aralığına sıkıştırılır
+# 0: < $0.01 (8 basamak, sondaki sıfırlar atılır), 1-2: < $1, 3: >= $1
+_PRICE_FMTS = ("${:.8f}", "${:.4f}", "${:.4f}", "${:,.2f}")
+# Hacim: floor(log10(hacim)) // 3 -> birim, K, M
+_VOLUME_FMTS = ("{:.0f}", "{:.0f}K", "{:.1f}M")
+_VOLUME_DIVS = (1, 1_000, 1_000_000)
+
+
+def _format_price(price: float) -> str:
+    """Format a price with more decimals for smaller prices (örn: $0.000023)."""
+    idx = min(3, max(0, math.floor(math.log10(price)) + 3)) if price > 0 else 0
+    # log10 yuvarlaması eşiği aşmasın (örn: 0.00999... -> -2.0)
+    if idx and price < 10.0 ** (idx - 3):
+        idx -= 1
+    if idx == 0:
+        return _PRICE_FMTS[0].format(price).rstrip('0').rstrip('.')
+    return _PRICE_FMTS[idx].format(price)
+
+
+def _format_volume(volume_usd: float) -> str:
+    """Format a USD volume compactly (300K, 1.5M gibi)."""
+    idx = min(2, max(0, math.floor(math.log10(volume_usd)) // 3)) if volume_usd > 0 else 0
+    if idx and volume_usd < _VOLUME_DIVS[idx]:
+        idx -= 1
+    return _VOLUME_FMTS[idx].format(volume_usd / _VOLUME_DIVS[idx])
 
 
 
@@ -60,25 +102,32 @@ class FuturesIntelligenceBot:
         self.signal_manager: Optional[SignalManager] = None
         self._running: bool = False
         self._alerted_symbols: set = set()
-        self._alert_cooldown: dict = {}
+        self._alert_cooldown: dict = {}  # symbol -> time.monotonic()
+        self._cycle_count: int = 0
 
     async def initialize(self):
         """Initialize all components."""
         logger.info("Initializing Futures Intelligence Bot...")
         
-        self.scanner = BinanceFuturesScanner()
+        # Tek CCXT örneği: tarayıcı ve momentum analizi aynı market önbelleğini,
+        # bağlantı havuzunu ve rate limit sayacını paylaşır
+        self.exchange = ccxt.binance({
+            'enableRateLimit': True,
+            'options': {
+                'defaultType': 'future',
+                'adjustForTimeDifference': True
+            }
+        })
+
+        self.scanner = BinanceFuturesScanner(exchange=self.exchange)
+        # Parite listesini ilk döngüden önce yükle (load_markets soğuk başlangıcı)
+        await self.scanner.fetch_usdt_futures_pairs(force_refresh=True)
         self.inspector = OnChainInspector()
         self.reporter = TelegramReporter()
         
         # Initialize signal manager for dashboard
         self.signal_manager = SignalManager()
         
-        # Initialize CCXT for momentum analysis
-        self.exchange = ccxt.binance({
-            'enableRateLimit': True,
-            'options': {'defaultType': 'future'}
-        })
-        
         # Initialize Telegram callback handler
         await self.reporter.initialize_callback_handler()
 
@@ -102,6 +151,8 @@ class FuturesIntelligenceBot:
             await self.exchange.close()
         if self.reporter:
             await self.reporter.shutdown()
+        if self.signal_manager:
+            self.signal_manager.close()
         
         logger.info("Shutdown complete")
 
@@ -110,21 +161,29 @@ class FuturesIntelligenceBot:
         Check if we should alert for this symbol (cooldown logic).
         Prevents spam by enforcing 5-minute cooldown per symbol.
         """
-        now = datetime.now()
+        # monotonic: duvar saati (NTP) kaymalarından etkilenmez, nesne ayırmaz
         last_alert = self._alert_cooldown.get(symbol)
         
         if last_alert is None:
             return True
         
-        cooldown_seconds = 300
-        if (now - last_alert).total_seconds() > cooldown_seconds:
+        age = time.monotonic() - last_alert
+        if age > 2 * _ALERT_COOLDOWN_SECONDS:
+            # Bayat kayıt: sözlük sınırsız büyümesin
+            del self._alert_cooldown[symbol]
             return True
-        
-        return False
+        return age > _ALERT_COOLDOWN_SECONDS
 
     def _mark_alerted(self, symbol: str):
         """Mark symbol as recently alerted."""
-        self._alert_cooldown[symbol] = datetime.now()
+        self._alert_cooldown[symbol] = time.monotonic()
+
+    def _sweep_cooldowns(self):
+        """Drop cooldown entries of symbols that have not come back for a while."""
+        cutoff = time.monotonic() - 2 * _ALERT_COOLDOWN_SECONDS
+        self._alert_cooldown = {
+            symbol: ts for symbol, ts in self._alert_cooldown.items() if ts >= cutoff
+        }
 
     async def process_opportunity(
         self,
@@ -151,27 +210,52 @@ class FuturesIntelligenceBot:
 
     async def run_scan_cycle(self):
         """Execute one complete scan cycle - HYBRID MODE."""
-        cycle_start = datetime.now()
+        cycle_start = time.perf_counter()
         logger.info(f"{'='*50}")
-        logger.info(f"Starting scan cycle at {cycle_start.strftime('%H:%M:%S')}")
+        logger.info(f"Starting scan cycle at {datetime.now().strftime('%H:%M:%S')}")
+
+        self._cycle_count += 1
+        if self._cycle_count % _COOLDOWN_SWEEP_EVERY == 0:
+            self._sweep_cooldowns()
+
+        # Dashboard sinyalleri döngü sonunda tek seferde kaydedilir
+        dashboard_signals = []
 
         try:
-            opportunities = await self.scanner.scan(max_concurrent=15)
+            # ccxt.pro varsa 5dk kline'lar WebSocket'ten gelir, yoksa REST.
+            # Her döngüde: ilk parite yüklemesi başarısız olduysa akış burada
+            # başlar, önbellek tazelenince yeni listelenen pariteler eklenir.
+            pairs = await self.scanner.fetch_usdt_futures_pairs()
+            self.scanner.start_kline_stream(pairs)
+
+            # Sadece en güçlü 5 fırsat işlenir
+            opportunities = await self.scanner.scan(max_concurrent=15, top_k=5)
 
             if not opportunities:
                 logger.info("No significant opportunities found this cycle.")
                 return
 
-            logger.info(f"Found {len(opportunities)} potential opportunities")
+            logger.info(f"Processing top {len(opportunities)} opportunities")
 
             # BULUNAN HER FIRSAT İÇİN (ilk 5 tanesini işle)
-            for scan_result in opportunities[:5]:
+            for scan_result in opportunities:
                 if not self._should_alert(scan_result.symbol):
                     logger.debug(f"Skipping {scan_result.symbol} - cooldown active")
                     continue
 
-                # 1. GELİŞMİŞ ANALİZ (YENİ ANALİST MODU!)
-                analysis = await get_advanced_analysis(self.exchange, scan_result.symbol)
+                # 1. GELİŞMİŞ ANALİZ + 2. ON-CHAIN ANALİZ
+                # Birbirinden bağımsız I/O: ikisi aynı anda çalışır
+                analysis, signal = await asyncio.gather(
+                    get_advanced_analysis(self.exchange, scan_result.symbol),
+                    self.process_opportunity(scan_result),
+                    return_exceptions=True
+                )
+                if isinstance(analysis, Exception):
+                    logger.error(f"Analysis error for {scan_result.symbol}: {analysis}")
+                    analysis = None
+                if isinstance(signal, Exception):
+                    logger.error(f"Inspector error for {scan_result.symbol}: {signal}")
+                    signal = None
                 
                 # Eğer analiz başarısızsa bu coini atla
                 if not analysis:
@@ -181,20 +265,13 @@ class FuturesIntelligenceBot:
                 # ============================================================
                 # 🛑 FİLTRE: 5 Dakikalık Değişim %1'den Azsa ATLA
                 # ============================================================
-                pct_val = analysis['change_5m']
+                pct_val = analysis.change_5m
                 
                 if abs(pct_val) < 1.0:
                     logger.info(f"💤 {scan_result.symbol} pas geçildi: 5dk değişim %{pct_val:.2f} (Limit: >%1.0)")
                     continue  # Bu coini geç, mesaj atma!
                 # ============================================================
 
-                # 2. On-Chain Analiz Yapmaya Çalış
-                try:
-                    signal = await self.process_opportunity(scan_result)
-                except Exception as e:
-                    logger.error(f"Inspector error for {scan_result.symbol}: {e}")
-                    signal = None
-
                 # 3. BAŞLIK İKONU BELİRLE (Hibrit Mantık)
                 if signal and signal.signal_type in [SignalType.SHORT, SignalType.LONG]:
                     header_icon = "🚨 BALİNA TESPİT EDİLDİ"
@@ -207,17 +284,17 @@ class FuturesIntelligenceBot:
                 # Format: COIN - EMOJI - BB_PRICE - 5M_%
                 
                 # 1. Coin Adı (Sadece sembol)
-                coin_name = analysis['symbol'].split('/')[0]
+                coin_name = base_asset_from_symbol(analysis.symbol)
                 
                 # 2. Yön Emojisi ve Bollinger Band Fiyatı
-                if analysis['direction'] == "LONG":
+                if analysis.is_long:
                     emoji = "🟢"
                     # Yükseliyorsa Alt Band'ı göster (destek seviyesi)
-                    bb_target = analysis['bb_lower']
+                    bb_target = analysis.bb_lower
                 else:
                     emoji = "🔴"
                     # Düşüyorsa Üst Band'ı göster (direnç seviyesi)
-                    bb_target = analysis['bb_upper']
+                    bb_target = analysis.bb_upper
                 
                 # 3. 5 Dakikalık Yüzde Formatla
                 if pct_val > 0:
@@ -226,13 +303,7 @@ class FuturesIntelligenceBot:
                     pct_str = f"%{pct_val:.2f}"
                 
                 # 4. Hacim değerini formatlı göster (300K, 1.5M gibi)
-                volume_usd = scan_result.volume_usd_5m
-                if volume_usd >= 1_000_000:
-                    volume_str = f"{volume_usd / 1_000_000:.1f}M"
-                elif volume_usd >= 1_000:
-                    volume_str = f"{volume_usd / 1_000:.0f}K"
-                else:
-                    volume_str = f"{volume_usd:.0f}"
+                volume_str = _format_volume(scan_result.volume_usd_5m)
                 
                 # FINAL COMPACT MESSAGE - YENİ SIRALAMA
                 # Format: #COIN 🟢 Fiyat: $95,234.56 | 300K | 3.2x | BB: 45234.5678 | +%0.85
@@ -240,19 +311,13 @@ class FuturesIntelligenceBot:
                 current_price = scan_result.current_price
                 
                 # Fiyat formatlaması - küçük fiyatlar için daha fazla basamak
-                if current_price >= 1:
-                    price_str = f"${current_price:,.2f}"
-                elif current_price >= 0.01:
-                    price_str = f"${current_price:.4f}"
-                else:
-                    # Çok küçük fiyatlar için (örn: $0.000023)
-                    price_str = f"${current_price:.8f}".rstrip('0').rstrip('.')
+                price_str = _format_price(current_price)
                 
                 message = f"#{coin_name} {emoji} Fiyat: {price_str} | {volume_str} | {volume_spike:.1f}x | BB: {bb_target:.4f} | {pct_str}\n\n"
                 
                 # Linkler (sadeleştirilmiş)
-                tv_link = f"https://www.tradingview.com/chart/?symbol=BINANCE%3A{coin_name}USDT.P"
-                binance_link = f"https://www.binance.com/en/futures/{coin_name}USDT"
+                tv_link = _TV_LINK_TMPL.format(coin_name)
+                binance_link = _BINANCE_LINK_TMPL.format(coin_name)
                 message += f"[TradingView]({tv_link}) | [Binance]({binance_link})"
 
                 # 5. LOG VE TELEGRAM'A GÖNDER
@@ -264,29 +329,39 @@ class FuturesIntelligenceBot:
                 if self.reporter and TELEGRAM_BOT_TOKEN != "YOUR_BOT_TOKEN_HERE":
                     await self.reporter.send_simple_message(message, coin_name=coin_name)
                 
-                # Send signal to dashboard
-                self.signal_manager.add_signal({
-                    'coin': coin_name,
-                    'emoji': emoji,
-                    'price': current_price,
-                    'volume': volume_str,
-                    'volume_spike': volume_spike,
-                    'bb_target': bb_target,
-                    'change_5m': pct_str,
-                    'direction': analysis['direction'],
-                    'tv_link': tv_link,
-                    'binance_link': binance_link
-                })
+                # Queue signal for the dashboard
+                dashboard_signals.append(DashboardSignal(
+                    coin=coin_name,
+                    emoji=emoji,
+                    price=current_price,
+                    volume=volume_str,
+                    volume_spike=volume_spike,
+                    bb_target=bb_target,
+                    change_5m=pct_str,
+                    direction=analysis.direction,
+                    tv_link=tv_link,
+                    binance_link=binance_link
+                ))
 
                 self._mark_alerted(scan_result.symbol)
                 
-                # Telegram rate limit yememek için az bekle
-                await asyncio.sleep(1)
+                # AIORateLimiter yoksa (aiolimiter kurulu değil) gönderimler
+                # kısıtsız; Telegram 429 yememek için eski 1s beklemeye dön
+                if self.reporter and not self.reporter.is_rate_limited:
+                    await asyncio.sleep(1)
 
         except Exception as e:
             logger.error(f"Error in scan cycle: {e}", exc_info=True)
 
-        cycle_duration = (datetime.now() - cycle_start).total_seconds()
+        # Send signals to dashboard (hata olsa bile gönderilmiş olanlar kaydedilir)
+        # Dosya yazma + webhook POST senkron; event loop'u bloklamasın
+        if dashboard_signals:
+            try:
+                await asyncio.to_thread(self.signal_manager.add_signals, dashboard_signals)
+            except Exception as e:
+                logger.error(f"Failed to store dashboard signals: {e}")
+
+        cycle_duration = time.perf_counter() - cycle_start
         logger.info(f"Cycle completed in {cycle_duration:.1f}s")
 
     async def run(self):
@@ -294,6 +369,11 @@ class FuturesIntelligenceBot:
         await self.initialize()
         self._running = True
 
+        # Python 3.12+: beklemeden biten görevler (önbellek/erken dönüş) kuyruğa hiç girmez
+        eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+        if eager_task_factory is not None:
+            asyncio.get_running_loop().set_task_factory(eager_task_factory)
+
         logger.info(f"Starting main loop (interval: {SCAN_INTERVAL_SECONDS}s)")
         logger.info("Press Ctrl+C to stop\n")
 
@@ -347,8 +427,10 @@ async def main():
 
 
 if __name__ == "__main__":
+    loop_factory = uvloop.new_event_loop if UVLOOP_AVAILABLE else None
     try:
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(main())
     except KeyboardInterrupt:
         print("\n👋 Bot stopped by user")
     except Exception as e:
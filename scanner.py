@@ -4,26 +4,76 @@ Scans Binance Futures for volume spikes and price momentum.
 """
 
 import asyncio
+import heapq
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 import ccxt.async_support as ccxt
+import numpy as np
+
+try:
+    import ccxt.pro as ccxtpro
+    CCXT_PRO_AVAILABLE = True
+except ImportError:
+    # Eski ccxt sürümleri: WebSocket yok, her taramada REST kline
+    CCXT_PRO_AVAILABLE = False
 
 from config import (
     VOLUME_SPIKE_MULTIPLIER,
     PRICE_CHANGE_THRESHOLD,
     MIN_VOLUME_USD_5M,
+    PAIRS_CACHE_TTL_SECONDS,
     TOKEN_ADDRESSES
 )
 
 logger = logging.getLogger(__name__)
 
+# Tarama penceresi: 5dk mumlar, son mum + önceki 11 (1 saat)
+_KLINE_TIMEFRAME = '5m'
+_KLINE_MS = 5 * 60 * 1000
+_KLINE_CANDLES = 12
+# Binance futures tek bağlantıda en fazla 200 akış kabul eder
+_STREAM_CHUNK = 100
+_STREAM_RETRY_SECONDS = 5.0
+# Aynı (sembol, hata tipi) en fazla 5 dakikada bir loglanır
+_ERROR_LOG_COOLDOWN = 300.0
+
+
+@lru_cache(maxsize=256)
+def base_asset_from_symbol(symbol: str) -> str:
+    """
+    Extract the base asset from a ccxt symbol ('BTC/USDT:USDT' -> 'BTC').
+
+    Sembol kümesi küçük ve sabit; aynı semboller her taramada tekrar gelir.
+    """
+    return symbol.split('/')[0].replace(':USDT', '')
+
+
+def _token_lut_entry(addresses: Dict[str, str]) -> tuple[Optional[str], str]:
+    if 'ethereum' in addresses:
+        return addresses['ethereum'], 'ethereum'
+    if 'bsc' in addresses:
+        return addresses['bsc'], 'bsc'
+    return None, 'unknown'
 
-@dataclass
+
+# TOKEN_ADDRESSES çalışma zamanında değişmez; (adres, zincir) çiftleri import'ta hazırlanır
+_TOKEN_LUT: Dict[str, tuple[Optional[str], str]] = {
+    asset.upper(): _token_lut_entry(addresses)
+    for asset, addresses in TOKEN_ADDRESSES.items()
+    if addresses
+}
+_NO_TOKEN: tuple[Optional[str], str] = (None, 'unknown')
+
+
+@dataclass(slots=True, frozen=True)
 class ScanResult:
-    """Represents a detected trading opportunity."""
+    """Represents a detected trading opportunity (immutable; shared across tasks)."""
     symbol: str
     base_asset: str
     current_price: float
@@ -46,6 +96,32 @@ class ScanResult:
         return abs(self.price_change_1h) >= PRICE_CHANGE_THRESHOLD
 
 
+def _volume_stats(ohlcv_list: List[List]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized volume stats for many OHLCV series at once.
+
+    Seriler sağa hizalanıp NaN ile doldurulur (yeni listelenen pariteler 12
+    mumdan kısa olabilir), böylece son sütun her zaman güncel mumdur.
+
+    Returns:
+        Tuple of (current_volume, avg_volume, volume_ratio) arrays; avg is the
+        mean of all candles but the last, ratio is 0 where avg is 0.
+    """
+    width = max(len(ohlcv) for ohlcv in ohlcv_list)
+    vols = np.full((len(ohlcv_list), width), np.nan, dtype=np.float64)
+    for row, ohlcv in zip(vols, ohlcv_list):
+        row[width - len(ohlcv):] = [candle[5] for candle in ohlcv]
+
+    current = np.nan_to_num(vols[:, -1])
+    prev = vols[:, :-1]
+    valid = ~np.isnan(prev)
+    counts = valid.sum(axis=1)
+    sums = np.where(valid, prev, 0.0).sum(axis=1)
+    avg = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    ratio = np.divide(current, avg, out=np.zeros_like(avg), where=avg > 0)
+    return current, avg, ratio
+
+
 class BinanceFuturesScanner:
     """
     Scans Binance USDT-M Futures for significant trading opportunities.
@@ -56,17 +132,34 @@ class BinanceFuturesScanner:
     - Price momentum: 1h change > 4%
     """
 
-    def __init__(self):
-        self.exchange = ccxt.binance({
+    def __init__(self, exchange: Optional[ccxt.binance] = None):
+        """
+        Args:
+            exchange: Shared ccxt binance instance. Verilirse sahipliği
+                çağırandadır ve close() onu kapatmaz.
+        """
+        self._owns_exchange = exchange is None
+        self.exchange = exchange if exchange is not None else ccxt.binance({
             'enableRateLimit': True,
             'options': {
                 'defaultType': 'future',
                 'adjustForTimeDifference': True
             }
         })
-        self._pairs_cache: List[str] = []
+        self._pairs_cache: Tuple[str, ...] = ()
         self._cache_time: Optional[datetime] = None
 
+        # WebSocket kline akışı (start_kline_stream); symbol -> son 12 mum
+        self._ws_exchange = None
+        self._kline_tasks: List[asyncio.Task] = []
+        self._stream_symbols: Set[str] = set()
+        self._rest_klines_logged = False
+        self._ohlcv_cache: Dict[str, List] = {}
+
+        # (symbol, hata tipi) -> son log zamanı (time.monotonic); log sırasıyla,
+        # en eski başta: bekleme süresi geçenler her kontrolde baştan atılır
+        self._error_logged: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+
     async def __aenter__(self):
         return self
 
@@ -74,30 +167,143 @@ class BinanceFuturesScanner:
         await self.close()
 
     async def close(self):
-        """Close the exchange connection."""
-        await self.exchange.close()
+        """Close the exchange connection (only if the scanner created it)."""
+        await self.stop_kline_stream()
+        if self._owns_exchange:
+            await self.exchange.close()
+
+    def start_kline_stream(self, symbols: Sequence[str]) -> bool:
+        """
+        Subscribe to 5m kline streams and keep the last 12 candles in memory.
+        
+        Akış çalışırken scan() kline'ları önbellekten okur; önbellekte
+        kesintisiz 12 güncel mum olmayan semboller için REST'e düşer ve REST
+        sonucu önbelleği tohumlar.
+        
+        Her döngüde güvenle çağrılabilir: akış zaten çalışıyorsa yalnızca
+        henüz abone olunmamış (sonradan listelenen) semboller eklenir.
+        
+        Returns:
+            True if the stream is running, False if ccxt.pro is unavailable
+            or there was nothing to subscribe to.
+        """
+        if not CCXT_PRO_AVAILABLE:
+            if not self._rest_klines_logged:
+                # Bir kez logla; tarama döngüsü her seferinde çağırır
+                logger.info("ccxt.pro not available, using REST klines")
+                self._rest_klines_logged = True
+            return False
+
+        new_symbols = [s for s in symbols if s not in self._stream_symbols]
+        if not new_symbols:
+            return bool(self._kline_tasks)
+
+        if self._ws_exchange is None:
+            self._ws_exchange = ccxtpro.binance({
+                'enableRateLimit': True,
+                'options': {'defaultType': 'future'}
+            })
+        for i in range(0, len(new_symbols), _STREAM_CHUNK):
+            chunk = new_symbols[i:i + _STREAM_CHUNK]
+            self._kline_tasks.append(asyncio.create_task(self._kline_pump(chunk)))
+        self._stream_symbols.update(new_symbols)
+        logger.info(
+            f"Kline stream subscribed {len(new_symbols)} pairs "
+            f"({len(self._stream_symbols)} total, {len(self._kline_tasks)} connections)"
+        )
+        return True
+
+    async def stop_kline_stream(self):
+        """Cancel the kline pump tasks and close the WebSocket exchange."""
+        tasks, self._kline_tasks = self._kline_tasks, []
+        self._stream_symbols.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._ws_exchange is not None:
+            await self._ws_exchange.close()
+            self._ws_exchange = None
+
+    async def _kline_pump(self, symbols: List[str]):
+        """Merge pushed kline updates for one group of symbols into the cache."""
+        subscriptions = [[symbol, _KLINE_TIMEFRAME] for symbol in symbols]
+        while True:
+            try:
+                updates = await self._ws_exchange.watch_ohlcv_for_symbols(subscriptions)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Kline stream error, retrying in {_STREAM_RETRY_SECONDS:.0f}s: {e}")
+                await asyncio.sleep(_STREAM_RETRY_SECONDS)
+                continue
+            for symbol, by_timeframe in updates.items():
+                candles = by_timeframe.get(_KLINE_TIMEFRAME)
+                if candles:
+                    self._merge_candles(symbol, candles)
+
+    def _merge_candles(self, symbol: str, candles: List, overwrite: bool = True):
+        """
+        Merge candles into the per-symbol cache by open time.
+        
+        Akış verisi (overwrite=True) aynı mumu günceller; REST tohumu
+        (overwrite=False) akıştan gelmiş daha taze mumu ezmez.
+        """
+        merged = {candle[0]: candle for candle in self._ohlcv_cache.get(symbol, ())}
+        for candle in candles:
+            if overwrite:
+                merged[candle[0]] = candle
+            else:
+                merged.setdefault(candle[0], candle)
+        self._ohlcv_cache[symbol] = [merged[ts] for ts in sorted(merged)[-_KLINE_CANDLES:]]
+
+    def _cached_ohlcv(self, symbol: str) -> Optional[List]:
+        """Return the streamed window if it is complete, gap-free and current."""
+        candles = self._ohlcv_cache.get(symbol)
+        if not candles or len(candles) < _KLINE_CANDLES:
+            return None
+        current_open = int(time.time() * 1000) // _KLINE_MS * _KLINE_MS
+        if candles[-1][0] < current_open:
+            return None  # Akış geride (yeniden bağlanma vb.)
+        if candles[-1][0] - candles[0][0] != (_KLINE_CANDLES - 1) * _KLINE_MS:
+            return None  # Pencerede boşluk var
+        return candles
+
+    async def _get_scan_ohlcv(self, symbol: str) -> List:
+        """Scan window klines: from the stream cache, else one REST request."""
+        ohlcv = self._cached_ohlcv(symbol)
+        if ohlcv is not None:
+            return ohlcv
+        # Son 5dk mumu + önceki 11 mumun ortalaması (1 saat), ağırlık 1
+        ohlcv = await self._fetch_ohlcv(symbol, _KLINE_TIMEFRAME, _KLINE_CANDLES)
+        if ohlcv and self._kline_tasks:
+            self._merge_candles(symbol, ohlcv, overwrite=False)
+        return ohlcv
 
-    async def fetch_usdt_futures_pairs(self, force_refresh: bool = False) -> List[str]:
+    async def fetch_usdt_futures_pairs(self, force_refresh: bool = False) -> Tuple[str, ...]:
         """
         Fetch all USDT-M perpetual futures symbols.
         
+        Sonuç PAIRS_CACHE_TTL_SECONDS boyunca değişmez bir tuple olarak
+        önbelleklenir; bot bunu initialize() sırasında ısıtır.
+        
         Args:
             force_refresh: Bypass cache and fetch fresh data.
             
         Returns:
-            List of trading pair symbols (e.g., ['BTC/USDT', 'ETH/USDT'])
+            Tuple of trading pair symbols (e.g., ('BTC/USDT:USDT', 'ETH/USDT:USDT'))
         """
         if (
             not force_refresh
             and self._pairs_cache
             and self._cache_time
-            and (datetime.now() - self._cache_time).seconds < 3600
+            and (datetime.now() - self._cache_time).total_seconds() < PAIRS_CACHE_TTL_SECONDS
         ):
             return self._pairs_cache
 
         try:
             markets = await self.exchange.load_markets()
-            usdt_pairs = [
+            usdt_pairs = tuple(
                 symbol for symbol, market in markets.items()
                 if (
                     market.get('quote') == 'USDT'
@@ -105,7 +311,7 @@ class BinanceFuturesScanner:
                     and market.get('active', True)
                     and ':USDT' in symbol
                 )
-            ]
+            )
             self._pairs_cache = usdt_pairs
             self._cache_time = datetime.now()
             logger.info(f"Loaded {len(usdt_pairs)} USDT-M futures pairs")
@@ -113,7 +319,7 @@ class BinanceFuturesScanner:
 
         except Exception as e:
             logger.error(f"Failed to fetch futures pairs: {e}")
-            return self._pairs_cache if self._pairs_cache else []
+            return self._pairs_cache
 
     async def _fetch_ohlcv(
         self,
@@ -121,7 +327,13 @@ class BinanceFuturesScanner:
         timeframe: str = '5m',
         limit: int = 12
     ) -> List:
-        """Fetch OHLCV candles for a symbol."""
+        """
+        Fetch OHLCV candles for a symbol.
+        
+        ccxt `limit`'i doğrudan /fapi/v1/klines'a iletir (varsayılan 500
+        eklenmez). Binance futures kline ağırlığı limit < 100 için 1'dir;
+        varsayılan 12 mum (1 saat) en küçük ağırlık dilimindedir.
+        """
         try:
             ohlcv = await self.exchange.fetch_ohlcv(
                 symbol,
@@ -129,58 +341,88 @@ class BinanceFuturesScanner:
                 limit=limit
             )
             return ohlcv
-        except Exception as e:
-            logger.debug(f"Failed to fetch OHLCV for {symbol}: {e}")
+        except (ccxt.BaseError, asyncio.TimeoutError) as e:
+            if self._should_log_error(symbol, e):
+                logger.debug(f"Failed to fetch OHLCV for {symbol}: {e}")
             return []
 
-    async def _fetch_ticker(self, symbol: str) -> Optional[Dict]:
-        """Fetch 24h ticker data for a symbol."""
+    def _should_log_error(self, symbol: str, error: BaseException) -> bool:
+        """
+        Throttle repeated errors per (symbol, error type).
+        
+        Delist/askıdaki bir parite her döngüde aynı hatayı verir; mesajı her
+        seferinde formatlayıp yazmak yerine 5 dakikada bir logla.
+        """
+        key = (symbol, type(error).__name__)
+        now = time.monotonic()
+        logged = self._error_logged
+        # Süresi dolanları temizle (delist olup bir daha görülmeyen pariteler birikmesin)
+        while logged:
+            oldest_key, oldest = next(iter(logged.items()))
+            if now - oldest < _ERROR_LOG_COOLDOWN:
+                break
+            del logged[oldest_key]
+        if key in logged:
+            return False
+        logged[key] = now
+        return True
+
+    async def _fetch_tickers(self) -> Dict[str, Dict]:
+        """
+        Fetch 24h tickers for every futures pair in one request.
+        
+        /fapi/v1/ticker/24hr sembolsüz çağrıldığında tüm pariteleri döner;
+        parite başına fetch_ticker yerine tarama başına tek istek.
+        """
         try:
-            ticker = await self.exchange.fetch_ticker(symbol)
-            return ticker
-        except Exception as e:
-            logger.debug(f"Failed to fetch ticker for {symbol}: {e}")
-            return None
+            return await self.exchange.fetch_tickers()
+        except (ccxt.BaseError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to fetch tickers: {e}")
+            return {}
 
-    def _get_token_address(self, base_asset: str) -> tuple[Optional[str], str]:
+    @staticmethod
+    def _get_token_address(base_asset: str) -> tuple[Optional[str], str]:
         """
         Get token contract address for on-chain analysis.
         
         Returns:
             Tuple of (address, chain) or (None, 'unknown')
         """
-        asset_upper = base_asset.upper()
-        if asset_upper in TOKEN_ADDRESSES:
-            addresses = TOKEN_ADDRESSES[asset_upper]
-            if 'ethereum' in addresses:
-                return addresses['ethereum'], 'ethereum'
-            elif 'bsc' in addresses:
-                return addresses['bsc'], 'bsc'
-        return None, 'unknown'
-
-    async def analyze_pair(self, symbol: str) -> Optional[ScanResult]:
+        return _TOKEN_LUT.get(base_asset.upper(), _NO_TOKEN)
+
+    async def analyze_pair(self, symbol: str, ticker: Dict) -> Optional[ScanResult]:
         """
         Analyze a single trading pair for opportunities.
         
         Args:
             symbol: Trading pair symbol (e.g., 'BTC/USDT:USDT')
+            ticker: 24h ticker for the symbol (from fetch_tickers)
             
         Returns:
             ScanResult if opportunity detected, None otherwise.
         """
-        ohlcv_task = self._fetch_ohlcv(symbol, '5m', 12)
-        ticker_task = self._fetch_ticker(symbol)
-        
-        ohlcv, ticker = await asyncio.gather(ohlcv_task, ticker_task)
+        if not ticker:
+            return None
 
-        if not ohlcv or len(ohlcv) < 2 or not ticker:
+        ohlcv = await self._get_scan_ohlcv(symbol)
+
+        if not ohlcv or len(ohlcv) < 2:
             return None
 
-        volumes = [candle[5] for candle in ohlcv]
-        current_volume = volumes[-1] if volumes else 0
-        avg_volume = sum(volumes[:-1]) / len(volumes[:-1]) if len(volumes) > 1 else 1
-        volume_ratio = current_volume / avg_volume if avg_volume > 0 else 0
+        current_volume, avg_volume, volume_ratio = (
+            float(v[0]) for v in _volume_stats([ohlcv])
+        )
+        return self._evaluate(symbol, ticker, current_volume, avg_volume, volume_ratio)
 
+    def _evaluate(
+        self,
+        symbol: str,
+        ticker: Dict,
+        current_volume: float,
+        avg_volume: float,
+        volume_ratio: float
+    ) -> Optional[ScanResult]:
+        """Apply the volume/momentum filters to precomputed volume stats."""
         current_price = ticker.get('last', 0)
         price_change_pct = ticker.get('percentage', 0) or 0
         
@@ -197,14 +439,14 @@ class BinanceFuturesScanner:
         if not (is_volume_spike or is_price_momentum):
             return None
 
-        triggers = []
-        if is_volume_spike:
-            triggers.append(f"Volume Spike: {volume_ratio:.1f}x")
+        # Liste + join yerine doğrudan birleştirme (en fazla iki parça)
+        trigger_reason = f"Volume Spike: {volume_ratio:.1f}x" if is_volume_spike else ""
         if is_price_momentum:
             direction = "📈" if price_change_pct > 0 else "📉"
-            triggers.append(f"Price {direction}: {price_change_pct:+.2f}%")
+            momentum = f"Price {direction}: {price_change_pct:+.2f}%"
+            trigger_reason = f"{trigger_reason} | {momentum}" if trigger_reason else momentum
 
-        base_asset = symbol.split('/')[0]
+        base_asset = base_asset_from_symbol(symbol)
         token_address, chain = self._get_token_address(base_asset)
 
         return ScanResult(
@@ -216,15 +458,16 @@ class BinanceFuturesScanner:
             volume_usd_5m=volume_5m_usd,  # USD değerini ekliyoruz
             avg_volume_1h=avg_volume,
             volume_spike_ratio=volume_ratio,
-            trigger_reason=" | ".join(triggers),
+            trigger_reason=trigger_reason,
             token_address=token_address,
             chain=chain
         )
 
     async def scan(
         self,
-        symbols: Optional[List[str]] = None,
-        max_concurrent: int = 10
+        symbols: Optional[Sequence[str]] = None,
+        max_concurrent: int = 10,
+        top_k: Optional[int] = None
     ) -> List[ScanResult]:
         """
         Scan all or specified symbols for opportunities.
@@ -232,9 +475,11 @@ class BinanceFuturesScanner:
         Args:
             symbols: Optional list of symbols to scan. If None, scans all.
             max_concurrent: Maximum concurrent API calls.
+            top_k: Return only the k strongest volume spikes. If None,
+                returns every opportunity.
             
         Returns:
-            List of detected opportunities.
+            List of detected opportunities, strongest volume spike first.
         """
         if symbols is None:
             symbols = await self.fetch_usdt_futures_pairs()
@@ -243,26 +488,62 @@ class BinanceFuturesScanner:
             logger.warning("No symbols to scan")
             return []
 
+        tickers = await self._fetch_tickers()
+        if not tickers:
+            logger.warning("No tickers available, skipping scan")
+            return []
+
+        # Ticker'ı olmayan (delist/askıda) pariteler için OHLCV isteği atma
+        symbols = [sym for sym in symbols if tickers.get(sym)]
+
         logger.info(f"Scanning {len(symbols)} futures pairs...")
         results: List[ScanResult] = []
-        semaphore = asyncio.Semaphore(max_concurrent)
 
-        async def analyze_with_limit(sym: str) -> Optional[ScanResult]:
-            async with semaphore:
-                return await self.analyze_pair(sym)
+        # Sabit sayıda işçi kuyruktan sembol çeker; parite başına görev oluşturulmaz
+        queue: asyncio.Queue = asyncio.Queue()
+        for sym in symbols:
+            queue.put_nowait(sym)
+
+        fetched_symbols: List[str] = []
+        fetched_ohlcv: List[List] = []
+
+        async def worker() -> None:
+            while not queue.empty():
+                sym = queue.get_nowait()
+                try:
+                    ohlcv = await self._get_scan_ohlcv(sym)
+                except Exception as e:
+                    # ccxt dışı (ayrıştırma vb.) hatalar işçiyi durdurmasın
+                    logger.debug(f"Scan error: {e}")
+                    continue
+                if ohlcv and len(ohlcv) >= 2:
+                    fetched_symbols.append(sym)
+                    fetched_ohlcv.append(ohlcv)
+
+        await asyncio.gather(*(worker() for _ in range(min(max_concurrent, len(symbols)))))
+
+        if fetched_ohlcv:
+            # Hacim aritmetiği tüm pariteler için tek seferde
+            current, avg, ratio = _volume_stats(fetched_ohlcv)
+            for i, sym in enumerate(fetched_symbols):
+                try:
+                    result = self._evaluate(
+                        sym, tickers[sym],
+                        float(current[i]), float(avg[i]), float(ratio[i])
+                    )
+                except Exception as e:
+                    logger.debug(f"Scan error: {e}")
+                    continue
+                if result is not None:
+                    results.append(result)
 
-        tasks = [analyze_with_limit(sym) for sym in symbols]
-        scan_results = await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"Found {len(results)} opportunities")
 
-        for result in scan_results:
-            if isinstance(result, ScanResult):
-                results.append(result)
-            elif isinstance(result, Exception):
-                logger.debug(f"Scan error: {result}")
+        if top_k is not None:
+            # Sadece ilk k gerekiyorsa tam sıralama yerine O(n log k) yığın
+            return heapq.nlargest(top_k, results, key=lambda x: x.volume_spike_ratio)
 
         results.sort(key=lambda x: x.volume_spike_ratio, reverse=True)
-
-        logger.info(f"Found {len(results)} opportunities")
         return results
 
 
@@ -3,111 +3,544 @@ Signal Manager - Centralized signal storage and distribution
 Handles signal persistence and retrieval for the web dashboard.
 """
 
+import atexit
 import json
 import logging
+import mmap
+import os
+import queue
+import re
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from itertools import count, islice
 from datetime import datetime
 from pathlib import Path
-from threading import Lock
-from typing import Dict, List, Optional
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # orjson yoksa stdlib json ile aynı dosya formatı
+    ORJSON_AVAILABLE = False
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    REQUESTS_AVAILABLE = True
+except ImportError:
+    # requests yoksa webhook gönderimi devre dışı
+    REQUESTS_AVAILABLE = False
+
+try:
+    from config import WEBHOOK_URL
+except ImportError:
+    WEBHOOK_URL = ""
 
 logger = logging.getLogger(__name__)
 
+# Eklenen sinyaller en fazla bu kadar bekleyip tek yazmada diske gider
+FLUSH_INTERVAL_SECONDS = 0.5
+# reload_from_disk en fazla bu aralıkla eski sinyal temizliği yapar
+CLEANUP_INTERVAL_SECONDS = 300
+# Yazma tamponu bundan büyürse serbest bırakılır (compaction sonrası vb.)
+_WRITE_BUFFER_MAX = 128 * 1024
+
+# Webhook POST'ları tek arka plan thread'inden, kalıcı bağlantı havuzuyla gider
+_webhook_queue: "queue.Queue[Dict]" = queue.Queue(maxsize=10000)
+_webhook_thread: Optional[Thread] = None
+_webhook_thread_lock = Lock()
+
+
+def _webhook_worker(url: str) -> None:
+    """Drain the webhook queue over one pooled requests.Session."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # Gövde önceden kodlanır (orjson); requests'in json= yolu stdlib json kullanır
+    session.headers['Content-Type'] = 'application/json'
+    
+    while True:
+        signal = _webhook_queue.get()
+        try:
+            response = session.post(url, data=_dumps(signal), timeout=5)
+            
+            if response.status_code == 200:
+                logger.info(f"📡 Webhook sent: {signal.get('coin')}")
+            else:
+                logger.warning(f"Webhook failed ({response.status_code}): {signal.get('coin')}")
+        
+        except Exception as e:
+            # Webhook hatası ana işlemi durdurmamalı
+            logger.debug(f"Webhook error (non-critical): {e}")
+
+
+def _ensure_webhook_worker(url: str) -> None:
+    """Start the webhook worker thread once per process."""
+    global _webhook_thread
+    with _webhook_thread_lock:
+        if _webhook_thread is None:
+            _webhook_thread = Thread(
+                target=_webhook_worker, args=(url,), name="signal-webhook", daemon=True
+            )
+            _webhook_thread.start()
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes (orjson if installed)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize to one compact UTF-8 JSON line (orjson if installed)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def _loads(data: Any) -> Any:
+    """Parse UTF-8 JSON bytes or a bytes-like buffer (orjson if installed)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+    return json.loads(data)
+
+
+# Eski depolama formatı: dosya tek bir JSON dizisi
+_LEGACY_ARRAY = re.compile(rb'\s*\[')
+
+
+@dataclass(slots=True)
+class DashboardSignal:
+    """Typed dashboard payload produced by the bot for each alert."""
+    coin: str
+    emoji: str
+    price: float
+    volume: str
+    volume_spike: float
+    bb_target: float
+    change_5m: str
+    direction: str
+    tv_link: str
+    binance_link: str
+
 
 class SignalManager:
     """
     Thread-safe signal manager for storing and retrieving trading signals.
     
-    Signals are stored in a JSON file and kept in memory for fast access.
+    Signals are stored in an append-only JSONL file (one signal per line,
+    oldest first) and kept in memory for fast access, newest first.
     Automatically maintains a maximum number of signals to prevent unbounded growth.
+    
+    Yeni sinyal dosyanın sonuna tek satır olarak eklenir; dosya
+    `max_signals * 1.5` satırı aşınca veya eski sinyaller temizlenince
+    bellekteki listeyle yeniden yazılır (compaction). Eski tek-dizi JSON
+    dosyaları yüklenirken otomatik olarak JSONL'e çevrilir.
+    
+    add_signal diske yazmaz: sinyaller bellekte sıraya alınır ve arka plan
+    thread'i FLUSH_INTERVAL_SECONDS içinde gelenleri tek yazmayla ekler.
+    Çıkışta (atexit) veya flush() ile bekleyenler senkron yazılır.
+    
+    Okuyucular (get_all_signals, get_latest_signal, get_stats) kilit almaz:
+    her yazma sonunda değişmez bir tuple + istatistik anlık görüntüsü tek
+    referans atamasıyla yayınlanır, okuyucu o anki görüntüyü kullanır.
     """
     
-    def __init__(self, storage_path: str = "data/dashboard_signals.json", max_signals: int = 1000):
+    def __init__(self, storage_path: str = "data/dashboard_signals.jsonl", max_signals: int = 1000):
         self.storage_path = Path(storage_path)
         self.max_signals = max_signals
-        self.signals: List[Dict] = []
+        # En yeni başta; maxlen dolunca en eski sinyal O(1) ile düşer
+        self.signals: deque = deque(maxlen=max_signals)
         self._lock = Lock()
+        # Dosya yazıcılarını sıralar; kodlama+yazma+fsync _lock dışında yapılır.
+        # Sıra her zaman _io_lock -> _lock.
+        self._io_lock = Lock()
+        self._file_lines = 0  # Diskteki satır sayısı (compaction eşiği için)
+        self._last_cleanup: Optional[float] = None  # time.monotonic()
+        # Son okunan/yazılan dosya durumu (st_mtime_ns, st_size); değişmediyse yeniden okuma
+        self._file_stamp: Optional[tuple] = None
+        # Son okumada '\n'siz (yazılmakta olan) bir son satır görüldü mü
+        self._torn_tail = False
+        
+        # Benzersiz, artan sinyal id'leri; yüklemede diskteki en büyük id'den devam
+        self._last_id = 0
+        self._ids = count(1)
+        
+        # Sorgu indeksleri: coin (büyük harf) -> sinyaller (yeniden eskiye), sayaçlar
+        self._by_coin: Dict[str, deque] = {}
+        self._coin_counts: Dict[str, int] = {}
+        self._long_count = 0
+        self._short_count = 0
+        
+        # Kilitsiz okuma için yayınlanan anlık görüntü: (sinyaller, (long, short, coins))
+        self._snapshot: tuple = ((), (0, 0, ()))
+        
+        # Diske yazılmayı bekleyen sinyaller (eskiden yeniye) ve flusher
+        self._pending: List[Dict] = []
+        self._dirty = Event()
+        self._closing = Event()
+        self._write_buf = bytearray()
         
         # Ensure data directory exists
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Load existing signals
         self._load_signals()
+        self._rebuild_indexes()
         logger.info(f"SignalManager initialized with {len(self.signals)} existing signals")
+        
+        self._flusher = Thread(target=self._flush_loop, name="signal-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+    
+    def _legacy_path(self) -> Optional[Path]:
+        """Pre-JSONL storage file next to a .jsonl storage path, if any."""
+        if self.storage_path.suffix != '.jsonl':
+            return None
+        legacy = self.storage_path.with_suffix('.json')
+        return legacy if legacy.exists() else None
+    
+    def _stat_stamp(self) -> Optional[tuple]:
+        """(st_mtime_ns, st_size) of the storage file, or None if it is missing."""
+        try:
+            st = os.stat(self.storage_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
     
     def _load_signals(self) -> None:
-        """Load signals from JSON file."""
-        if self.storage_path.exists():
-            try:
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    self.signals = json.load(f)
-                logger.info(f"Loaded {len(self.signals)} signals from {self.storage_path}")
-            except Exception as e:
-                logger.error(f"Failed to load signals: {e}")
-                self.signals = []
-        else:
+        """Load signals from the JSONL file (migrating legacy JSON arrays)."""
+        path = self.storage_path if self.storage_path.exists() else self._legacy_path()
+        if path is None:
             # Dosya yoksa boş liste ile başlat ve dosyayı oluştur
-            self.signals = []
+            self.signals = deque(maxlen=self.max_signals)
             self._save_signals()
             logger.info(f"Created new signal storage at {self.storage_path}")
+            return
+        
+        # Okumadan önce: okuma sırasında gelen yazma bir sonraki reload'da görülür
+        self._file_stamp = self._stat_stamp()
+        legacy = None
+        signals = []
+        corrupt = 0
+        lines = 0
+        torn = False
+        try:
+            with open(path, 'rb') as f:
+                # mmap: dosya sayfa önbelleğinden ayrıştırılır, tüm dosya için
+                # ayrı bir bytes kopyası oluşturulmaz (boş dosya map edilemez)
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if _LEGACY_ARRAY.match(mm):
+                            # Eski format: tek JSON dizisi, en yeni başta
+                            with memoryview(mm) as view:
+                                legacy = _loads(view)
+                        else:
+                            for line in iter(mm.readline, b''):
+                                if not line.endswith(b'\n'):
+                                    # '\n'siz son satır: başka süreç hâlâ 'ab' ile
+                                    # yazıyor olabilir, bozuk sayma
+                                    torn = bool(line.strip())
+                                    break
+                                lines += 1
+                                if not line.strip():
+                                    continue
+                                try:
+                                    signals.append(_loads(line))
+                                except Exception:
+                                    # Yarıda kalmış son satır vb.
+                                    corrupt += 1
+        except Exception as e:
+            logger.error(f"Failed to load signals: {e}")
+            self.signals = deque(maxlen=self.max_signals)
+            return
+        
+        if legacy is not None:
+            self.signals = deque(legacy[:self.max_signals], maxlen=self.max_signals)
+            self._save_signals()
+            logger.info(f"Migrated {len(self.signals)} signals from {path} to JSONL at {self.storage_path}")
+            return
+        
+        self._file_lines = lines
+        self._torn_tail = torn
+        if torn:
+            # Yazma bitince dosya değişir ama yazan çökmüşse değişmeyebilir:
+            # bir sonraki reload her durumda yeniden okusun
+            self._file_stamp = None
+        
+        # Dosya eskiden yeniye, bellek yeniden eskiye (en yeni max_signals)
+        self.signals = deque(islice(reversed(signals), self.max_signals), maxlen=self.max_signals)
+        logger.info(f"Loaded {len(self.signals)} signals from {self.storage_path}")
+        
+        if corrupt and not torn:
+            # Tam (satır sonlu) ama ayrıştırılamayan satır: yazma bitmiş, gerçekten bozuk
+            logger.warning(f"Skipped {corrupt} corrupt line(s) in {self.storage_path}, compacting")
+            self._save_signals()
+        elif self._file_lines > self.max_signals * 1.5 and not torn:
+            self._save_signals()
+    
+    def _rebuild_indexes(self) -> None:
+        """Rebuild coin index and counters from self.signals in one pass."""
+        self._by_coin = {}
+        self._coin_counts = {}
+        self._long_count = 0
+        self._short_count = 0
+        max_id = self._last_id
+        for signal in self.signals:
+            self._index_signal(signal, newest=False)
+            signal_id = signal.get('id')
+            if isinstance(signal_id, int) and signal_id > max_id:
+                max_id = signal_id
+        if max_id > self._last_id:
+            # Yeniden başlatma/başka süreç: id'ler yüklenen en büyük id'den sonra devam eder
+            self._last_id = max_id
+            self._ids = count(max_id + 1)
+        self._publish()
+    
+    def _publish(self) -> None:
+        """Publish an immutable read snapshot. Caller holds the lock."""
+        stats = (self._long_count, self._short_count, tuple(sorted(self._coin_counts)))
+        # Tek referans ataması: okuyucu ya eski ya yeni görüntüyü görür
+        self._snapshot = (tuple(self.signals), stats)
+    
+    def _index_signal(self, signal: Dict, newest: bool = True) -> None:
+        """Add one signal to the indexes (newest=True: in front of existing ones)."""
+        coin_key = signal.get('coin', '').upper()
+        bucket = self._by_coin.get(coin_key)
+        if bucket is None:
+            bucket = self._by_coin[coin_key] = deque()
+        if newest:
+            bucket.appendleft(signal)
+        else:
+            bucket.append(signal)
+        
+        coin = signal.get('coin', 'UNKNOWN')
+        self._coin_counts[coin] = self._coin_counts.get(coin, 0) + 1
+        
+        direction = signal.get('direction')
+        if direction == 'LONG':
+            self._long_count += 1
+        elif direction == 'SHORT':
+            self._short_count += 1
+    
+    def _unindex_oldest(self, signal: Dict) -> None:
+        """Remove the oldest stored signal (the one being evicted) from the indexes."""
+        coin_key = signal.get('coin', '').upper()
+        bucket = self._by_coin[coin_key]
+        bucket.pop()
+        if not bucket:
+            del self._by_coin[coin_key]
+        
+        coin = signal.get('coin', 'UNKNOWN')
+        remaining = self._coin_counts[coin] - 1
+        if remaining:
+            self._coin_counts[coin] = remaining
+        else:
+            del self._coin_counts[coin]
+        
+        direction = signal.get('direction')
+        if direction == 'LONG':
+            self._long_count -= 1
+        elif direction == 'SHORT':
+            self._short_count -= 1
+    
+    def _encode(self, signals: Iterable[Dict]) -> bytearray:
+        """Encode signals as JSONL into the reused write buffer."""
+        if len(self._write_buf) > _WRITE_BUFFER_MAX:
+            self._write_buf = bytearray()
+        buf = self._write_buf
+        buf.clear()
+        for signal in signals:
+            buf += _dumps_line(signal)
+        return buf
     
     def _save_signals(self) -> None:
-        """Save signals to JSON file."""
+        """
+        Rewrite (compact) the JSONL file from the in-memory signals.
+        
+        Önce yan dosyaya yazılıp fsync edilir, sonra os.replace ile atomik
+        olarak değiştirilir: yazma ortasında çökme eski dosyayı bozmaz.
+        """
+        # Bellekteki liste bekleyenleri de içerir
+        self._pending.clear()
+        self._write_compacted(self.signals)
+    
+    def _write_compacted(self, signals: Iterable[Dict]) -> None:
+        """Atomically rewrite the file from signals (newest first). Caller holds _io_lock."""
+        signals = tuple(signals)
+        tmp_path = self.storage_path.with_name(self.storage_path.name + '.tmp')
         try:
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(self.signals, f, indent=2, ensure_ascii=False)
+            with open(tmp_path, 'wb') as f:
+                f.write(self._encode(reversed(signals)))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.storage_path)
+            self._file_lines = len(signals)
+            self._torn_tail = False
+            # Kendi yazmamız: bellek zaten güncel, reload dosyayı tekrar okumasın
+            self._file_stamp = self._stat_stamp()
         except Exception as e:
             logger.error(f"Failed to save signals: {e}")
     
-    def add_signal(self, signal: Dict) -> None:
+    def _write_appended(self, signals: List[Dict]) -> None:
+        """Append signals (oldest first) as JSONL lines. Caller holds _io_lock."""
+        try:
+            with open(self.storage_path, 'ab') as f:
+                f.write(self._encode(signals))
+                # Parti başına tek fsync (flusher sinyalleri zaten topluyor)
+                f.flush()
+                os.fsync(f.fileno())
+            self._file_lines += len(signals)
+            self._file_stamp = self._stat_stamp()
+        except Exception as e:
+            logger.error(f"Failed to save signals: {e}")
+    
+    def _needs_compaction(self, adding: int) -> bool:
+        # Yarım son satırın devamına eklenmez; yazan süreç dosyayı bellekten yeniden yazar
+        return self._torn_tail or self._file_lines + adding > self.max_signals * 1.5
+    
+    def _flush_locked(self) -> None:
+        """Write pending signals to disk. Caller holds _io_lock and _lock."""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            if self._needs_compaction(len(pending)):
+                self._save_signals()
+            else:
+                self._write_appended(pending)
+    
+    def flush(self) -> None:
+        """
+        Synchronously write any pending signals to disk.
+        
+        Bekleyenler (veya compaction için anlık görüntü) _lock altında
+        alınır; kodlama ve yazma kilit bırakıldıktan sonra yapılır, böylece
+        add_signals ve get_signals_by_coin fsync'i beklemez.
+        """
+        with self._io_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                pending, self._pending = self._pending, []
+                snapshot = tuple(self.signals) if self._needs_compaction(len(pending)) else None
+            
+            if snapshot is not None:
+                self._write_compacted(snapshot)
+            else:
+                self._write_appended(pending)
+    
+    def _flush_loop(self) -> None:
+        """Background flusher: coalesce signals added within FLUSH_INTERVAL_SECONDS."""
+        while not self._closing.is_set():
+            self._dirty.wait()
+            if self._closing.is_set():
+                break  # Son flush'ı close() yapar
+            # Aynı pencerede gelen diğer sinyalleri de topla
+            time.sleep(FLUSH_INTERVAL_SECONDS)
+            self._dirty.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush signals: {e}")
+    
+    def close(self) -> None:
+        """
+        Stop the background flusher and write any pending signals.
+        
+        Flusher thread'i ve atexit kaydı örneğe referans tutar; close()
+        çağrılmazsa örnek ve thread süreç sonuna kadar yaşar. Tekrar
+        çağrılması zararsızdır.
+        """
+        if not self._closing.is_set():
+            self._closing.set()
+            self._dirty.set()  # wait() içindeki flusher'ı uyandır
+            self._flusher.join()
+            atexit.unregister(self.flush)
+        self.flush()
+    
+    def add_signal(self, signal: Union[Dict, DashboardSignal]) -> None:
         """
         Add a new signal to the storage.
         
         Args:
-            signal: Dictionary containing signal data (coin, price, emoji, etc.)
+            signal: DashboardSignal or dictionary containing signal data (coin, price, emoji, etc.)
         """
+        self.add_signals([signal])
+    
+    def add_signals(self, signals: Sequence[Union[Dict, DashboardSignal]]) -> None:
+        """
+        Add a batch of signals; the background flusher writes them to disk.
+        
+        Args:
+            signals: DashboardSignals or signal dictionaries in the order they were produced
+        """
+        if not signals:
+            return
+        
+        # Depolama/JSON katmanı dict ile çalışır; dönüşüm yalnızca burada yapılır
+        signals = [
+            asdict(signal) if isinstance(signal, DashboardSignal) else signal
+            for signal in signals
+        ]
+        
         with self._lock:
-            # Add timestamp if not present
-            if 'timestamp' not in signal:
-                signal['timestamp'] = datetime.now().isoformat()
-            
-            # Add unique ID
-            signal['id'] = len(self.signals) + 1
-            
-            # Add to beginning of list (newest first)
-            self.signals.insert(0, signal)
+            now = datetime.now()
+            inserted_at = now.timestamp()
+            for signal in signals:
+                # Add timestamp if not present; '_ts' temizlik için POSIX float.
+                # '_ts' her zaman ekleme anıdır (üreticinin saati değil): deque
+                # sırasıyla azalır, temizlik ilk eski sinyalde durabilir.
+                if 'timestamp' not in signal:
+                    signal['timestamp'] = now.isoformat()
+                    signal['_ts'] = inserted_at
+                elif self._parse_timestamp(signal) is None:
+                    # Geçersiz zaman damgası: temizlik dokunmaz (eski davranış)
+                    signal.pop('_ts', None)
+                else:
+                    signal['_ts'] = inserted_at
+                
+                # Add unique ID (len() tabanlı id eviction sonrası tekrar ediyordu)
+                signal['id'] = next(self._ids)
+            self._last_id = signals[-1]['id']
             
-            # Trim to max signals
-            if len(self.signals) > self.max_signals:
-                self.signals = self.signals[:self.max_signals]
+            # Add to beginning (newest first); maxlen en eskiyi kendisi düşürür
+            for signal in signals:
+                if len(self.signals) == self.max_signals:
+                    self._unindex_oldest(self.signals[-1])
+                self.signals.appendleft(signal)
+                self._index_signal(signal)
+            self._publish()
             
-            # Save to disk
-            self._save_signals()
-            
-            # Send to webhook (Railway dashboard) if configured
+            # Diske yazma arka planda: parti bekleyenlere eklenir
+            self._pending.extend(signals)
+            self._dirty.set()
+            total = len(self.signals)
+        
+        # Send to webhook (Railway dashboard) if configured — kilit dışında, kuyruğa
+        for signal in signals:
             self._send_webhook(signal)
-            
-            logger.info(f"Added signal: {signal.get('coin', 'UNKNOWN')} - Total: {len(self.signals)}")
+        
+        coins = ", ".join(s.get('coin', 'UNKNOWN') for s in signals)
+        logger.info(f"Added {len(signals)} signal(s): {coins} - Total: {total}")
     
     def _send_webhook(self, signal: Dict) -> None:
-        """Send signal to webhook URL (Railway dashboard)."""
+        """Queue signal for the webhook URL (Railway dashboard); never blocks."""
+        if not WEBHOOK_URL or not REQUESTS_AVAILABLE:
+            return  # Webhook not configured
+        
         try:
-            from config import WEBHOOK_URL
-            import requests
-            
-            if not WEBHOOK_URL:
-                return  # Webhook not configured
-            
-            response = requests.post(
-                WEBHOOK_URL,
-                json=signal,
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                logger.info(f"📡 Webhook sent: {signal.get('coin')}")
-            else:
-                logger.warning(f"Webhook failed ({response.status_code}): {signal.get('coin')}")
-                
+            if _webhook_thread is None:
+                _ensure_webhook_worker(WEBHOOK_URL)
+            _webhook_queue.put_nowait(signal)
+        
+        except queue.Full:
+            logger.warning(f"Webhook queue full, dropping: {signal.get('coin')}")
         except Exception as e:
             # Webhook hatası ana işlemi durdurmamalı
             logger.debug(f"Webhook error (non-critical): {e}")
@@ -122,15 +555,15 @@ class SignalManager:
         Returns:
             List of signal dictionaries
         """
-        with self._lock:
-            if limit is None:
-                return self.signals.copy()
-            return self.signals[:limit]
+        signals = self._snapshot[0]
+        if limit is None:
+            return list(signals)
+        return list(signals[:limit])
     
     def get_latest_signal(self) -> Optional[Dict]:
         """Get the most recent signal."""
-        with self._lock:
-            return self.signals[0] if self.signals else None
+        signals = self._snapshot[0]
+        return signals[0] if signals else None
     
     def get_signals_by_coin(self, coin: str, limit: Optional[int] = None) -> List[Dict]:
         """
@@ -143,41 +576,34 @@ class SignalManager:
         Returns:
             List of signal dictionaries for the specified coin
         """
+        # Coin deque'leri yazarla birlikte değişir; kısa O(k) kopya kilit altında
         with self._lock:
-            filtered = [s for s in self.signals if s.get('coin', '').upper() == coin.upper()]
+            bucket = self._by_coin.get(coin.upper())
+            if not bucket:
+                return []
             if limit:
-                return filtered[:limit]
-            return filtered
+                return list(islice(bucket, limit))
+            return list(bucket)
     
     def clear_all_signals(self) -> None:
         """Clear all signals from memory and storage."""
-        with self._lock:
-            self.signals = []
+        with self._io_lock, self._lock:
+            self.signals.clear()
+            self._rebuild_indexes()
             self._save_signals()
             logger.info("All signals cleared")
     
     def get_stats(self) -> Dict:
         """Get statistics about stored signals."""
-        with self._lock:
-            total = len(self.signals)
-            if total == 0:
-                return {
-                    'total': 0,
-                    'long_count': 0,
-                    'short_count': 0,
-                    'coins': []
-                }
-            
-            long_count = sum(1 for s in self.signals if s.get('direction') == 'LONG')
-            short_count = sum(1 for s in self.signals if s.get('direction') == 'SHORT')
-            coins = list(set(s.get('coin', 'UNKNOWN') for s in self.signals))
-            
-            return {
-                'total': total,
-                'long_count': long_count,
-                'short_count': short_count,
-                'coins': sorted(coins)
-            }
+        signals, (long_count, short_count, coins) = self._snapshot
+        
+        # Sayaçlar ekleme/temizleme sırasında güncel tutulur
+        return {
+            'total': len(signals),
+            'long_count': long_count,
+            'short_count': short_count,
+            'coins': list(coins)
+        }
     
     def reload_from_disk(self) -> int:
         """
@@ -186,12 +612,28 @@ class SignalManager:
         
         This is useful when bot and dashboard run in separate processes.
         """
-        with self._lock:
+        # _io_lock: süren bir flush yazmasını bitirmeden dosyayı okuma
+        with self._io_lock, self._lock:
+            # Bekleyenler diskte olmalı, yoksa yeniden yükleme onları düşürür
+            self._flush_locked()
             old_count = len(self.signals)
-            self._load_signals()
             
-            # Clean up old signals (older than 5 hours)
-            self._cleanup_old_signals(hours=5)
+            # Dosya son okuma/yazmamızdan beri değişmediyse tek stat() yeterli
+            changed = self._stat_stamp() != self._file_stamp
+            if changed:
+                self._load_signals()
+            
+            # Clean up old signals (older than 5 hours) — her yeniden yüklemede
+            # değil, en fazla CLEANUP_INTERVAL_SECONDS'ta bir
+            removed = 0
+            now = time.monotonic()
+            if self._last_cleanup is None or now - self._last_cleanup >= CLEANUP_INTERVAL_SECONDS:
+                removed = self._cleanup_old_signals(hours=5)
+                if not self._torn_tail:
+                    # Yarım satırlı dosya dokunulmadan kaldı; yeniden okumada tekrar temizle
+                    self._last_cleanup = now
+            if changed or removed:
+                self._rebuild_indexes()
             
             new_count = len(self.signals)
             
@@ -212,31 +654,59 @@ class SignalManager:
         """
         from datetime import datetime, timedelta
         
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        cutoff = (datetime.now() - timedelta(hours=hours)).timestamp()
         original_count = len(self.signals)
         
-        # Filter signals newer than cutoff
-        self.signals = [
-            s for s in self.signals
-            if self._is_signal_recent(s, cutoff_time)
-        ]
+        # Filter signals newer than cutoff. '_ts' ekleme anıdır ve liste
+        # yeniden eskiye sıralı: ilk eski '_ts'den sonraki '_ts'ler de eskidir.
+        # '_ts'si olmayanlar (eski kayıt / geçersiz zaman damgası) sıraya
+        # güvenilmeden tek tek karşılaştırılır; geçersizler her zamanki gibi tutulur.
+        kept = deque(maxlen=self.max_signals)
+        append = kept.append
+        parse = self._parse_timestamp
+        it = iter(self.signals)
+        for s in it:
+            ts = s.get('_ts')
+            if ts is None:
+                ts = parse(s)
+                if ts is None or ts > cutoff:
+                    append(s)
+                continue
+            if ts <= cutoff:
+                break
+            append(s)
+        # Kesimden sonra yalnızca '_ts'siz ve süresi dolmamışlar kalır
+        for s in it:
+            if s.get('_ts') is None:
+                ts = parse(s)
+                if ts is None or ts > cutoff:
+                    append(s)
+        self.signals = kept
         
         removed_count = original_count - len(self.signals)
         
-        if removed_count > 0:
+        # Başka süreç dosyaya hâlâ ekliyorsa (yarım son satır) yeniden yazma:
+        # os.replace onun yazdığı sinyalleri kaybettirir
+        if (removed_count > 0 or self._file_lines > self.max_signals * 1.5) and not self._torn_tail:
             self._save_signals()
+        if removed_count > 0:
             logger.info(f"🗑️ Cleaned up {removed_count} signals older than {hours} hours")
         
         return removed_count
     
-    def _is_signal_recent(self, signal: Dict, cutoff_time: datetime) -> bool:
-        """Check if signal is newer than cutoff time."""
+    @staticmethod
+    def _parse_timestamp(signal: Dict) -> Optional[float]:
+        """
+        POSIX time of the signal's ISO 'timestamp', or None if it is missing/invalid.
+        
+        Sonuç '_ts'ye yazılmaz: '_ts' yalnızca ekleme anı olmalı, yoksa
+        sıralamaya dayanan temizlik yanlış yerde durur.
+        """
         try:
-            signal_time = datetime.fromisoformat(signal['timestamp'])
-            return signal_time > cutoff_time
-        except (KeyError, ValueError):
+            return datetime.fromisoformat(signal['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
             # If no valid timestamp, keep the signal
-            return True
+            return None
 
 
 # Test code
@@ -244,7 +714,7 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     
     # Create test signal manager
-    manager = SignalManager("data/test_signals.json")
+    manager = SignalManager("data/test_signals.jsonl")
     
     # Add test signal
     test_signal = {
@@ -269,3 +739,5 @@ if __name__ == "__main__":
     # Get stats
     stats = manager.get_stats()
     print(f"📊 Stats: {stats}")
+    
+    manager.close()
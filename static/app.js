@@ -36,6 +36,13 @@ function initializeWebSocket() {
         playNotificationSound();
     });
 
+    // Batched broadcast: signals are ordered oldest -> newest
+    socket.on('new_signals', (data) => {
+        console.log(`📊 ${data.signals.length} new signal(s) received`);
+        addNewSignals(data.signals);
+        playNotificationSound();
+    });
+
     socket.on('signals_data', (data) => {
         console.log(`📥 Received ${data.signals.length} signals`);
         allSignals = data.signals;
@@ -69,6 +76,14 @@ function addNewSignal(signal) {
     updateStats();
 }
 
+// Add a batch of new signals (oldest first) with a single render
+function addNewSignals(signals) {
+    signals.forEach(signal => allSignals.unshift(signal));
+
+    renderSignals();
+    updateStats();
+}
+
 // Render signals to DOM
 function renderSignals() {
     const container = document.getElementById('signalsContainer');
@@ -0,0 +1,57 @@
+"""
+Smoke test: dashboard.py must start and accept connections.
+
+eventlet.monkey_patch() altında engelleyen bir dosya izleyici (ör. inotify
+Observer) socketio.run'a ulaşılmadan süreci kilitleyebilir; bu test sunucunun
+gerçekten port açtığını doğrular.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("eventlet")
+pytest.importorskip("flask_socketio")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STARTUP_TIMEOUT_SECONDS = 15
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_dashboard_binds(tmp_path):
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    
+    # data/ geçici dizine yazılsın diye cwd = tmp_path
+    proc = subprocess.Popen(
+        [sys.executable, str(REPO_ROOT / "dashboard.py")],
+        cwd=tmp_path, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            assert proc.poll() is None, proc.stderr.read().decode(errors="replace")
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        pytest.fail(f"dashboard did not bind port {port} within {STARTUP_TIMEOUT_SECONDS}s")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
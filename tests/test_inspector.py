@@ -0,0 +1,50 @@
+"""analyze_transfers: early return for unclassified windows must match the computed path."""
+
+import dataclasses
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from inspector import OnChainInspector, SignalType, Transfer, WalletType
+
+
+def _transfer(i, from_type=WalletType.UNKNOWN, to_type=WalletType.UNKNOWN, age_seconds=60):
+    return Transfer(
+        tx_hash=f"0x{i:064x}",
+        from_address=f"0x{i:040x}",
+        to_address=f"0x{i + 1:040x}",
+        value=1000.0 + i,
+        value_usd=0.0,
+        timestamp_unix=time.time() - age_seconds,
+        from_type=from_type,
+        to_type=to_type,
+    )
+
+
+def _fields(signal):
+    d = dataclasses.asdict(signal)
+    d.pop("timestamp")
+    return d
+
+
+@pytest.fixture
+def inspector(tmp_path, monkeypatch):
+    # Disk önbelleği / known_wallets okunurken repo dizinine dokunma
+    monkeypatch.chdir(tmp_path)
+    return OnChainInspector()
+
+
+def test_unclassified_window_matches_computed_neutral(inspector):
+    unclassified = [_transfer(i) for i in range(5)]
+    # Sınıflandırılmış ama skor üretmeyen pencere (eski whale->whale): hesaplanan yoldan geçer
+    computed = [_transfer(i, WalletType.WHALE, WalletType.WHALE, age_seconds=7200) for i in range(5)]
+    
+    early = inspector.analyze_transfers(unclassified, current_price=2.0)
+    full = inspector.analyze_transfers(computed, current_price=2.0)
+    
+    assert full.signal_type is SignalType.NEUTRAL
+    assert _fields(early) == _fields(full)
+    assert early.evidence == []
+    assert early.confidence_score == 20
@@ -0,0 +1,146 @@
+"""SignalManager: cleanup, half-written lines and shutdown."""
+
+import gc
+import threading
+import weakref
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+
+from signal_manager import SignalManager
+
+
+def _write_jsonl(path, signals_oldest_first):
+    path.write_bytes(b"".join(orjson.dumps(s) + b"\n" for s in signals_oldest_first))
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return tmp_path / "signals.jsonl"
+
+
+@pytest.fixture
+def make_manager(storage):
+    """Factory for managers on the temp storage file; all are closed at teardown."""
+    created = []
+    
+    def make():
+        m = SignalManager(str(storage), max_signals=50)
+        created.append(m)
+        return m
+    
+    yield make
+    for m in created:
+        m.close()
+
+
+@pytest.fixture
+def manager(make_manager):
+    return make_manager()
+
+
+def _cleanup(manager, hours=5):
+    with manager._lock:
+        removed = manager._cleanup_old_signals(hours=hours)
+        manager._rebuild_indexes()
+    return removed
+
+
+def test_cleanup_keeps_timestamp_less_signals_after_expired_ones(storage, make_manager):
+    now = datetime.now()
+    old = now - timedelta(hours=10)
+    # Dosya eskiden yeniye; '_ts'siz kayıtlar eski sürümden kalma
+    _write_jsonl(storage, [
+        {'id': 1, 'coin': 'NOTS', 'direction': 'LONG'},
+        {'id': 2, 'coin': 'BADTS', 'direction': 'LONG', 'timestamp': 'not-a-date'},
+        {'id': 3, 'coin': 'LEGACY_NEW', 'direction': 'LONG', 'timestamp': now.isoformat()},
+        {'id': 4, 'coin': 'OLD', 'direction': 'SHORT', 'timestamp': old.isoformat(), '_ts': old.timestamp()},
+        {'id': 5, 'coin': 'NEW', 'direction': 'LONG', 'timestamp': now.isoformat(), '_ts': now.timestamp()},
+    ])
+    manager = make_manager()
+    removed = _cleanup(manager)
+    manager.flush()
+    
+    expected = ['NEW', 'LEGACY_NEW', 'BADTS', 'NOTS']
+    assert removed == 1
+    assert [s['coin'] for s in manager.get_all_signals()] == expected
+    
+    # Diskteki sıkıştırılmış dosya da aynı sinyalleri tutar
+    reloaded = make_manager()
+    assert [s['coin'] for s in reloaded.get_all_signals()] == expected
+
+
+def test_cleanup_ignores_producer_timestamp_order(manager):
+    # Başka makineden/API'den gelen eski zaman damgası, sonradan eklense bile
+    # önündeki taze sinyallerin silinmesine yol açmamalı
+    for coin in ('A', 'B', 'C'):
+        manager.add_signal({'coin': coin, 'direction': 'LONG'})
+    stale = (datetime.now() - timedelta(hours=6)).isoformat()
+    manager.add_signal({'coin': 'REMOTE', 'direction': 'SHORT', 'timestamp': stale})
+    
+    assert _cleanup(manager) == 0
+    assert [s['coin'] for s in manager.get_all_signals()] == ['REMOTE', 'C', 'B', 'A']
+    assert manager.get_all_signals()[0]['timestamp'] == stale
+
+
+def test_torn_last_line_is_left_for_the_writer(storage, make_manager):
+    _write_jsonl(storage, [{'id': 1, 'coin': 'A', 'direction': 'LONG'}])
+    # Başka süreç 'ab' ile yazmanın ortasında: '\n' henüz yok
+    partial = orjson.dumps({'id': 2, 'coin': 'B', 'direction': 'SHORT'})
+    with open(storage, 'ab') as f:
+        f.write(partial[:10])
+    before = storage.read_bytes()
+    
+    reader = make_manager()
+    assert [s['coin'] for s in reader.get_all_signals()] == ['A']
+    # Okuyan süreç dosyayı yeniden yazmamalı (os.replace yazanın verisini kaybettirir)
+    assert storage.read_bytes() == before
+    assert reader.reload_from_disk() == 1
+    assert storage.read_bytes() == before
+    
+    with open(storage, 'ab') as f:
+        f.write(partial[10:] + b'\n')
+    assert reader.reload_from_disk() == 2
+    assert [s['coin'] for s in reader.get_all_signals()] == ['B', 'A']
+
+
+def test_complete_corrupt_line_is_compacted(storage, make_manager):
+    _write_jsonl(storage, [{'id': 1, 'coin': 'A', 'direction': 'LONG'}])
+    with open(storage, 'ab') as f:
+        f.write(b'{"bad":\n')
+    
+    manager = make_manager()
+    assert storage.read_bytes().count(b'\n') == 1
+    assert [s['coin'] for s in manager.get_all_signals()] == ['A']
+
+
+def test_writer_rewrites_torn_tail_instead_of_appending(storage, make_manager):
+    _write_jsonl(storage, [{'id': 1, 'coin': 'A', 'direction': 'LONG'}])
+    with open(storage, 'ab') as f:
+        f.write(b'{"id": 2, "co')  # çökmüş yazmadan kalan yarım satır
+    
+    manager = make_manager()
+    manager.add_signal({'coin': 'C', 'direction': 'LONG'})
+    manager.flush()
+    
+    lines = storage.read_bytes().splitlines()
+    assert [orjson.loads(line)['coin'] for line in lines] == ['A', 'C']
+
+
+def test_close_stops_flusher_and_releases_manager(storage):
+    before = threading.active_count()
+    managers = [SignalManager(str(storage), max_signals=50) for _ in range(3)]
+    managers[0].add_signal({'coin': 'A', 'direction': 'LONG'})
+    refs = [weakref.ref(m) for m in managers]
+    
+    for m in managers:
+        m.close()
+        m.close()  # idempotent
+    del managers, m
+    gc.collect()
+    
+    assert threading.active_count() == before
+    assert all(ref() is None for ref in refs)
+    # close() bekleyenleri diske yazar
+    assert [orjson.loads(line)['coin'] for line in storage.read_bytes().splitlines()] == ['A']